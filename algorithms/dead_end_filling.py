@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+"""
+Dead end filling, a preprocessing pass that shrinks the space searched by `Maze.find_way_out`.
+
+A dead end is an open cell with at most one way in or out. Unless it is the start, an exit
+or a hollow no shortest path goes through it, so it is sealed, which may turn the cell it
+hung off into a new dead end. Sealing runs off a worklist until no dead end is left, every
+cell is sealed at most once so the pass is linear in the number of cells.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from maze import Maze
+
+# The direction bit pointing back, bits are in the order of Maze.directions (up, down, left, right).
+OPPOSITE_BITS: dict[int, int] = {1: 2, 2: 1, 4: 8, 8: 4}
+
+
+@dataclass
+class DeadEndFill:
+    """
+    masks: The neighbour masks of the maze with every sealed cell closed off as if it were a wall.
+    flags: One byte per cell, 1 when the cell is sealed.
+    sealed: The sealed cells in the order they were sealed.
+    parents: For each cell in sealed, the open cell it hung off when it was sealed, -1 if none.
+    """
+    masks: bytearray
+    flags: bytearray
+    sealed: array
+    parents: array
+
+
+def fill_dead_ends(maze: Maze) -> DeadEndFill:
+    """
+    Seals every dead end of the maze that is not the start, an exit or a hollow, see the module documentation.
+
+    Args:
+        maze(Maze): The maze to fill, it is not changed.
+
+    Returns:
+        DeadEndFill - The filled neighbour masks and the cells sealed.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is the number of cells in the maze.
+        Worst Case Complexity: O(N) where N is the number of cells in the maze.
+    """
+    cols: int = maze.cols
+    masks: bytearray = bytearray(maze.neighbour_masks)
+    protected: set[int] = {maze.start_position.pack(cols)} | {position.pack(cols) for position in maze.end_positions}
+    degrees: bytearray = bytearray(bin(mask).count("1") for mask in masks)
+    worklist: List[int] = [index for index in range(maze.rows * cols)
+                           if degrees[index] <= 1 and index not in protected
+                           and not maze._is_wall(index) and not maze._is_hollow(index)]
+    flags: bytearray = bytearray(len(masks))
+    sealed: array = array('i')
+    parents: array = array('i')
+    while worklist:
+        index: int = worklist.pop()
+        parent: int = -1
+        for bit, offset in maze.neighbour_offsets:
+            if masks[index] & bit:
+                parent = index + offset
+                masks[parent] &= ~OPPOSITE_BITS[bit]
+                degrees[parent] -= 1
+                if degrees[parent] == 1 and parent not in protected and not maze._is_hollow(parent):
+                    worklist.append(parent)
+        masks[index] = 0
+        flags[index] = 1
+        sealed.append(index)
+        parents.append(parent)
+    return DeadEndFill(masks, flags, sealed, parents)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+"""
+Hierarchical path finding (HPA*) for large mazes.
+
+The maze is cut into square clusters of cluster_size x cluster_size cells. Wherever two
+neighbouring clusters share a run of open cells along their border one entrance is placed
+in the middle of the run, made of a cell on each side. The entrance cells of a cluster are
+linked by their distances inside the cluster, found once and cached. A query only searches
+the small abstract graph of entrances, then refines the chosen entrances back into single
+steps inside the clusters the path goes through.
+
+Paths found are valid but may be slightly longer than the shortest path.
+"""
+
+import heapq
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from maze import Maze
+
+
+class ClusterGraph:
+    """ The cached abstract graph of a maze, see the module documentation. """
+
+    def __init__(self, maze: Maze, cluster_size: int = 16) -> None:
+        """
+        Args:
+            maze(Maze): The maze to build the graph of.
+            cluster_size(int): The height and width of the clusters in cells.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N * S) where N is the number of cells in the maze and
+            S is cluster_size, as each entrance runs a search over its own cluster.
+        """
+        if cluster_size < 1:
+            raise ValueError("Clusters must be at least one cell wide")
+        self.maze: Maze = maze
+        self.cluster_size: int = cluster_size
+        self.cluster_rows: int = -(-maze.rows // cluster_size)
+        self.cluster_cols: int = -(-maze.cols // cluster_size)
+        # Entrances of every border, keyed by the (smaller, larger) pair of cluster ids.
+        self.entrances: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # The cells each entrance cell connects to across a border.
+        self.partners: Dict[int, List[int]] = {}
+        # For each cluster, the distance from each of its entrance cells to the others.
+        self.edges: Dict[int, Dict[int, Dict[int, int]]] = {}
+        clusters: int = self.cluster_rows * self.cluster_cols
+        for cluster in range(clusters):
+            self._build_borders(cluster, forward_only=True)
+        for cluster in range(clusters):
+            self._build_edges(cluster)
+
+    def cluster_of(self, index: int) -> int:
+        row, col = divmod(index, self.maze.cols)
+        return (row // self.cluster_size) * self.cluster_cols + col // self.cluster_size
+
+    def bounds(self, cluster: int) -> Tuple[int, int, int, int]:
+        """
+        Returns:
+            Tuple[int, int, int, int] - The first and last row, then the first and last column of cluster.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        first_row, first_col = cluster_row * self.cluster_size, cluster_col * self.cluster_size
+        return (first_row, min(first_row + self.cluster_size, self.maze.rows) - 1,
+                first_col, min(first_col + self.cluster_size, self.maze.cols) - 1)
+
+    def neighbouring_clusters(self, cluster: int) -> List[int]:
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        neighbours: List[int] = []
+        for row_step, col_step in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            if 0 <= cluster_row + row_step < self.cluster_rows and 0 <= cluster_col + col_step < self.cluster_cols:
+                neighbours.append(cluster + row_step * self.cluster_cols + col_step)
+        return neighbours
+
+    def _build_border(self, first: int, second: int) -> None:
+        """
+        Places the entrances between two neighbouring clusters, first being above or left of second.
+
+        Complexity:
+            Best/Worst Case O(S) where S is cluster_size.
+        """
+        for first_cell, second_cell in self.entrances.pop((first, second), []):
+            self.partners[first_cell].remove(second_cell)
+            self.partners[second_cell].remove(first_cell)
+        cols: int = self.maze.cols
+        masks: bytearray = self.maze.neighbour_masks
+        first_row, last_row, first_col, last_col = self.bounds(first)
+        if second == first + self.cluster_cols:  # horizontal border, cross it moving down
+            bit, step = self.maze.neighbour_offsets[1]
+            cells: List[int] = [last_row * cols + col for col in range(first_col, last_col + 1)]
+        else:  # vertical border, cross it moving right
+            bit, step = self.maze.neighbour_offsets[3]
+            cells = [row * cols + last_col for row in range(first_row, last_row + 1)]
+
+        entrances: List[Tuple[int, int]] = []
+        run: List[int] = []
+        for cell in cells + [-1]:
+            if cell != -1 and masks[cell] & bit:
+                run.append(cell)
+                continue
+            if run:
+                middle: int = run[len(run) // 2]
+                entrances.append((middle, middle + step))
+                self.partners.setdefault(middle, []).append(middle + step)
+                self.partners.setdefault(middle + step, []).append(middle)
+                run = []
+        self.entrances[(first, second)] = entrances
+
+    def _build_borders(self, cluster: int, forward_only: bool = False) -> None:
+        for neighbour in self.neighbouring_clusters(cluster):
+            if neighbour > cluster:
+                self._build_border(cluster, neighbour)
+            elif not forward_only:
+                self._build_border(neighbour, cluster)
+
+    def nodes(self, cluster: int) -> List[int]:
+        """ The entrance cells inside cluster. """
+        nodes: List[int] = []
+        for neighbour in self.neighbouring_clusters(cluster):
+            key: Tuple[int, int] = (min(cluster, neighbour), max(cluster, neighbour))
+            for first, second in self.entrances.get(key, []):
+                nodes.append(first if cluster == key[0] else second)
+        return nodes
+
+    def local_search(self, source: int) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Breadth first search from source that never leaves the cluster of source.
+
+        Returns:
+            Tuple[Dict[int, int], Dict[int, int]] - The distance to and parent of every cell reached.
+
+        Complexity:
+            Best/Worst Case O(S^2) where S is cluster_size.
+        """
+        cols: int = self.maze.cols
+        first_row, last_row, first_col, last_col = self.bounds(self.cluster_of(source))
+        distances: Dict[int, int] = {source: 0}
+        parents: Dict[int, int] = {source: -1}
+        queue: Deque[int] = deque([source])
+        while queue:
+            current: int = queue.popleft()
+            for neighbour in self.maze.neighbours(current):
+                row, col = divmod(neighbour, cols)
+                if neighbour not in distances and first_row <= row <= last_row and first_col <= col <= last_col:
+                    distances[neighbour] = distances[current] + 1
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        return distances, parents
+
+    def _build_edges(self, cluster: int) -> None:
+        """
+        Caches the distances between the entrance cells of cluster.
+
+        Complexity:
+            Best/Worst Case O(E * S^2) where E is the number of entrance cells in the cluster
+            and S is cluster_size.
+        """
+        nodes: List[int] = self.nodes(cluster)
+        edges: Dict[int, Dict[int, int]] = {}
+        for node in nodes:
+            distances, _ = self.local_search(node)
+            edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self.edges[cluster] = edges
+
+    def update(self, index: int) -> None:
+        """
+        Rebuilds the part of the graph affected by a change to the cell at index, the entrances
+        around its cluster and the cached distances of its cluster and the clusters next to it.
+
+        Complexity:
+            Best/Worst Case O(E * S^2) where E is the number of entrance cells in the five
+            clusters rebuilt and S is cluster_size.
+        """
+        cluster: int = self.cluster_of(index)
+        self._build_borders(cluster)
+        for affected in [cluster] + self.neighbouring_clusters(cluster):
+            self._build_edges(affected)
+
+    def find_path(self, start: int) -> List[int] | None:
+        """
+        Plans over the abstract graph from start to the nearest exit then refines the plan into single steps.
+
+        Returns:
+            List[int] | None - The cell indices of the path, None if no exit can be reached.
+
+        Complexity:
+            Best Case Complexity: O(S^2) when the start is an exit, where S is cluster_size.
+            Worst Case Complexity: O(X * S^2 + V log V) where X is the number of exits and
+            V the number of entrance cells in the maze.
+        """
+        maze: Maze = self.maze
+        cols: int = maze.cols
+        exits: List[int] = [position.pack(cols) for position in maze.end_positions]
+        exit_cells: List[Tuple[int, int]] = [divmod(index, cols) for index in exits]
+
+        def heuristic(index: int) -> int:
+            row, col = divmod(index, cols)
+            return min(abs(row - exit_row) + abs(col - exit_col) for exit_row, exit_col in exit_cells)
+
+        # Link the start and exits into the graph with searches inside their own clusters.
+        start_distances, _ = self.local_search(start)
+        start_edges: Dict[int, int] = {node: start_distances[node] for node in self.nodes(self.cluster_of(start))
+                                       if node in start_distances}
+        exit_edges: Dict[int, Dict[int, int]] = {}
+        for index in exits:
+            distances, _ = self.local_search(index)
+            if index in start_distances:
+                start_edges[index] = start_distances[index]
+            for node in self.nodes(self.cluster_of(index)):
+                if node in distances:
+                    exit_edges.setdefault(node, {})[index] = distances[node]
+
+        parents: Dict[int, int] = {start: -1}
+        costs: Dict[int, int] = {start: 0}
+        expanded: set[int] = set()
+        frontier: List[Tuple[int, int, int]] = [(heuristic(start), 0, start)]
+        found: int = -1
+        while frontier:
+            _, cost, current = heapq.heappop(frontier)
+            if current in expanded:
+                continue
+            expanded.add(current)
+            if maze.is_exit(current):
+                found = current
+                break
+            successors: Dict[int, int] = dict(start_edges if current == start
+                                              else self.edges[self.cluster_of(current)].get(current, {}))
+            for partner in self.partners.get(current, []):
+                successors[partner] = 1
+            for index, distance in exit_edges.get(current, {}).items():
+                successors[index] = min(distance, successors.get(index, distance))
+            for node, distance in successors.items():
+                if node not in expanded and cost + distance < costs.get(node, cost + distance + 1):
+                    costs[node] = cost + distance
+                    parents[node] = current
+                    heapq.heappush(frontier, (cost + distance + heuristic(node), cost + distance, node))
+        if found == -1:
+            return None
+
+        plan: List[int] = []
+        while found != -1:
+            plan.append(found)
+            found = parents[found]
+        plan.reverse()
+        path: List[int] = [start]
+        for target in plan[1:]:
+            source: int = path[-1]
+            if target in self.partners.get(source, []):
+                path.append(target)
+                continue
+            # Every other abstract edge joins two cells of the same cluster.
+            _, local_parents = self.local_search(source)
+            steps: List[int] = []
+            while target != source:
+                steps.append(target)
+                target = local_parents[target]
+            path.extend(reversed(steps))
+        return path
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+"""
+Incremental path finding (D* Lite) for mazes that change between queries.
+
+The planner searches backwards from every exit towards the start, keeping for each
+cell it has touched g, its last known number of moves to the nearest exit, and rhs,
+the one step lookahead 1 + min(g of its neighbours). A cell is consistent when the
+two agree. When walls are added or removed only the changed cells and their
+neighbours are made inconsistent again, and the next query repairs the previous
+search from there, expanding only the cells whose distance actually changed and
+that matter to the start.
+
+Moving the start keeps the previous search too, the key modifier km makes up for
+the heuristic changing under the cells already queued.
+"""
+
+import heapq
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from maze import Maze
+
+INFINITY: float = float("inf")
+
+
+class IncrementalPlanner:
+    """ A D* Lite planner over a maze, see the module documentation. """
+
+    def __init__(self, maze: Maze, start: int) -> None:
+        """
+        Args:
+            maze(Maze): The maze to plan in, it must report its changes through `notify`.
+            start(int): The packed cell index to plan from.
+
+        Complexity:
+            Best Case Complexity: O(X) where X is the number of exits.
+            Worst Case Complexity: O(X) where X is the number of exits.
+        """
+        self.maze: Maze = maze
+        self.start: int = start
+        self.expanded: int = 0
+        self._km: int = 0
+        self._g: Dict[int, float] = {}
+        self._rhs: Dict[int, float] = {}
+        self._queued: Dict[int, Tuple[float, float]] = {}
+        self._queue: List[Tuple[Tuple[float, float], int]] = []
+        self._changed: set[int] = set()
+        for position in maze.end_positions:
+            index: int = position.pack(maze.cols)
+            self._rhs[index] = 0
+            self._push(index)
+
+    def _heuristic(self, index: int) -> int:
+        row, col = divmod(index, self.maze.cols)
+        start_row, start_col = divmod(self.start, self.maze.cols)
+        return abs(row - start_row) + abs(col - start_col)
+
+    def _key(self, index: int) -> Tuple[float, float]:
+        best: float = min(self._g.get(index, INFINITY), self._rhs.get(index, INFINITY))
+        return best + self._heuristic(index) + self._km, best
+
+    def _push(self, index: int) -> None:
+        key: Tuple[float, float] = self._key(index)
+        self._queued[index] = key
+        heapq.heappush(self._queue, (key, index))
+
+    def _top_key(self) -> Tuple[float, float]:
+        """ The smallest key queued, dropping the entries left behind by re-queued cells. """
+        while self._queue:
+            key, index = self._queue[0]
+            if self._queued.get(index) == key:
+                return key
+            heapq.heappop(self._queue)
+        return INFINITY, INFINITY
+
+    def _update_cell(self, index: int) -> None:
+        """
+        Recomputes rhs of a cell from its neighbours and queues the cell while it is inconsistent.
+
+        Complexity:
+            Best Case Complexity: O(1) when the cell stays consistent.
+            Worst Case Complexity: O(log Q) where Q is the number of entries queued.
+        """
+        if not self.maze.is_exit(index):
+            self._rhs[index] = min((self._g.get(neighbour, INFINITY) + 1 for neighbour in self.maze.neighbours(index)),
+                                   default=INFINITY)
+        if self._g.get(index, INFINITY) != self._rhs.get(index, INFINITY):
+            self._push(index)
+        else:
+            self._queued.pop(index, None)
+
+    def notify(self, index: int) -> None:
+        """
+        Records that the cell at index changed, the search is repaired on the next `path`.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._changed.add(index)
+
+    def move_to(self, start: int) -> None:
+        """
+        Plans from a new start, reusing the search done so far.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._km += self._heuristic(start)
+        self.start = start
+
+    def _repair(self) -> None:
+        """
+        Makes the changed cells and their neighbours consistent again then re-runs the search
+        until the distance of the start is known.
+
+        Complexity:
+            Best Case Complexity: O(C) where C is the number of cells changed, when the start is not affected.
+            Worst Case Complexity: O(N log N) where N is the number of cells in the maze.
+        """
+        cols: int = self.maze.cols
+        for index in self._changed:
+            row, col = divmod(index, cols)
+            self._update_cell(index)
+            for row_step, col_step in self.maze.directions.values():
+                if 0 <= row + row_step < self.maze.rows and 0 <= col + col_step < cols:
+                    self._update_cell(index + row_step * cols + col_step)
+        self._changed.clear()
+
+        while self._top_key() < self._key(self.start) \
+                or self._rhs.get(self.start, INFINITY) != self._g.get(self.start, INFINITY):
+            old_key, current = heapq.heappop(self._queue)
+            new_key: Tuple[float, float] = self._key(current)
+            if old_key < new_key:
+                self._push(current)
+                continue
+            del self._queued[current]
+            self.expanded += 1
+            if self._g.get(current, INFINITY) > self._rhs[current]:
+                self._g[current] = self._rhs[current]
+            else:
+                self._g[current] = INFINITY
+                self._update_cell(current)
+            for neighbour in self.maze.neighbours(current):
+                self._update_cell(neighbour)
+
+    def path(self) -> List[int] | None:
+        """
+        Repairs the search after the changes since the last call and returns the current best path.
+
+        Returns:
+            List[int] | None - The cell indices of a shortest path from the start to the nearest exit,
+            None if no exit can be reached.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, when nothing changed.
+            Worst Case Complexity: O(N log N) where N is the number of cells in the maze.
+        """
+        self._repair()
+        if self._g.get(self.start, INFINITY) == INFINITY:
+            return None
+        path: List[int] = [self.start]
+        while not self.maze.is_exit(path[-1]):
+            path.append(min(self.maze.neighbours(path[-1]), key=lambda neighbour: self._g.get(neighbour, INFINITY)))
+        return path
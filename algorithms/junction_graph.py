@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+"""
+Corridor contraction of a maze into a graph of junctions.
+
+Every open cell with exactly two ways in and out is part of a corridor, every other open
+cell (junctions, dead ends) and every start, exit or hollow cell is a node. Walking a
+corridor from a node always ends at a node, so the maze collapses into a weighted graph
+whose edges store the corridor length and the packed cells of the corridor in between.
+Searches then take one step per corridor instead of one per cell and expand the edges
+they choose back into single steps.
+"""
+
+import heapq
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from maze import Maze
+
+# (node at the other end, number of moves, packed cells strictly between the two nodes in walking order)
+Edge = Tuple[int, int, array]
+
+
+class JunctionGraph:
+    """ The contracted graph of a maze, see the module documentation. """
+
+    def __init__(self, maze: Maze) -> None:
+        """
+        Args:
+            maze(Maze): The maze to contract.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze,
+            every corridor cell is walked once from each end.
+        """
+        self.maze: Maze = maze
+        masks: bytearray = maze.neighbour_masks
+        special: set[int] = {maze.start_position.pack(maze.cols)} | {position.pack(maze.cols) for position in maze.end_positions}
+        self.nodes: set[int] = {index for index in range(maze.rows * maze.cols)
+                                if not maze._is_wall(index)
+                                and (bin(masks[index]).count("1") != 2 or index in special or maze._is_hollow(index))}
+        self.edges: Dict[int, List[Edge]] = {node: self._walk_from(node) for node in self.nodes}
+
+    def _walk_from(self, source: int) -> List[Edge]:
+        """
+        Walks every corridor leaving source up to the node at its other end.
+        Corridors that loop back to source are left out as they never shorten a path.
+
+        Complexity:
+            Best/Worst Case O(C) where C is the number of cells in the corridors leaving source.
+        """
+        edges: List[Edge] = []
+        for first in self.maze.neighbours(source):
+            previous, current = source, first
+            run: array = array('I')
+            while current not in self.nodes and current != source:
+                run.append(current)
+                previous, current = current, next(neighbour for neighbour in self.maze.neighbours(current)
+                                                  if neighbour != previous)
+            if current != source:
+                edges.append((current, len(run) + 1, run))
+        return edges
+
+    def find_path(self, start: int) -> Tuple[List[int] | None, List[int]]:
+        """
+        Dijkstra's algorithm over the junctions from start to the nearest exit.
+
+        Args:
+            start(int): The packed cell index to search from, a start inside a corridor is linked
+            to the nodes at both ends of its corridor for this search only.
+
+        Returns:
+            Tuple[List[int] | None, List[int]] - The cell indices of a shortest path, None if no
+            exit can be reached, and the nodes settled by the search in the order they were settled.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, when the start is an exit.
+            Worst Case Complexity: O(N + J log J) where N is the number of cells in the maze, to expand
+            the path, and J is the number of nodes.
+        """
+        distances: Dict[int, int] = {start: 0}
+        parents: Dict[int, Tuple[int, array]] = {}
+        settled: List[int] = []
+        done: set[int] = set()
+        frontier: List[Tuple[int, int]] = [(0, start)]
+        found: int = -1
+        while frontier:
+            distance, current = heapq.heappop(frontier)
+            if current in done:
+                continue
+            done.add(current)
+            settled.append(current)
+            if self.maze.is_exit(current):
+                found = current
+                break
+            for node, length, run in self.edges[current] if current in self.nodes else self._walk_from(current):
+                if node not in done and distance + length < distances.get(node, distance + length + 1):
+                    distances[node] = distance + length
+                    parents[node] = (current, run)
+                    heapq.heappush(frontier, (distance + length, node))
+        if found == -1:
+            return None, settled
+
+        path: List[int] = []
+        while found != start:
+            previous, run = parents[found]
+            path.append(found)
+            path.extend(reversed(run))
+            found = previous
+        path.append(start)
+        path.reverse()
+        return path, settled
@@ -0,0 +1,456 @@
+from __future__ import annotations
+
+"""
+Search engines used by `Maze.find_way_out`.
+
+Every engine works on packed cell indices (row * cols + col) and has the signature
+    engine(maze, start) -> List[int] | None
+returning the cell indices of a path from start to one of the maze's exits, or None when
+no exit can be reached. Engines mark every cell they expand as visited through
+`Maze.mark_visited` and are iterative, so they are not limited by the recursion limit.
+"""
+
+import heapq
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the wavefront engine falls back to breadth_first_search
+    np = None
+
+if TYPE_CHECKING:
+    from algorithms.incremental_search import IncrementalPlanner
+    from maze import Maze
+
+SearchEngine = Callable[["Maze", int], "List[int] | None"]
+
+
+def reconstruct_path(parents: Dict[int, int], end: int) -> List[int]:
+    """
+    Follows the parent links from end back to the cell whose parent is -1.
+
+    Returns:
+        List[int] - The cell indices from the first cell to end.
+
+    Complexity:
+        Best/Worst Case O(L) where L is the length of the path.
+    """
+    path: List[int] = []
+    while end != -1:
+        path.append(end)
+        end = parents[end]
+    path.reverse()
+    return path
+
+
+def breadth_first_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Finds a shortest path to the nearest exit.
+
+    Complexity:
+        Best Case O(1) when the start is an exit.
+        Worst Case O(N) where N is the number of cells in the maze.
+    """
+    parents: Dict[int, int] = {start: -1}
+    queue: Deque[int] = deque([start])
+    while queue:
+        current: int = queue.popleft()
+        maze.mark_visited(current)
+        if maze.is_exit(current):
+            return reconstruct_path(parents, current)
+        for neighbour in maze.neighbours(current):
+            if neighbour not in parents:
+                parents[neighbour] = current
+                queue.append(neighbour)
+    return None
+
+
+def depth_first_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Finds a path to an exit keeping only the current frontier on an explicit stack.
+    The path found is not necessarily the shortest.
+
+    Complexity:
+        Best Case O(1) when the start is an exit.
+        Worst Case O(N) where N is the number of cells in the maze.
+    """
+    parents: Dict[int, int] = {start: -1}
+    stack: List[int] = [start]
+    while stack:
+        current: int = stack.pop()
+        maze.mark_visited(current)
+        if maze.is_exit(current):
+            return reconstruct_path(parents, current)
+        for neighbour in maze.neighbours(current):
+            if neighbour not in parents:
+                parents[neighbour] = current
+                stack.append(neighbour)
+    return None
+
+
+def bidirectional_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Runs a breadth first search forwards from the start and backwards from every exit at once,
+    always growing the smaller frontier by a whole layer, until the two searches meet.
+    The layer in which they meet is finished so the path found is a shortest path.
+
+    Only cells reached from the start are marked visited: the cells the forward side expands and
+    the cells of the path. When the backward side runs out of cells first there is no way out and
+    the forward side carries on until it has visited every cell reachable from the start.
+
+    Complexity:
+        Best Case O(1) when the start is an exit.
+        Worst Case O(N) where N is the number of cells in the maze.
+    """
+    if maze.is_exit(start):
+        maze.mark_visited(start)
+        return [start]
+    # Each side maps a discovered cell to (parent, depth), parents lead back to the start
+    # for the forward side and to an exit for the backward side.
+    forward: Dict[int, tuple[int, int]] = {start: (-1, 0)}
+    backward: Dict[int, tuple[int, int]] = {position.pack(maze.cols): (-1, 0) for position in maze.end_positions}
+    forward_layer: List[int] = [start]
+    backward_layer: List[int] = list(backward)
+
+    while forward_layer and backward_layer:
+        expand_forward: bool = len(forward_layer) <= len(backward_layer)
+        layer, discovered, others = (forward_layer, forward, backward) if expand_forward \
+            else (backward_layer, backward, forward)
+        next_layer: List[int] = []
+        best: tuple[int, int, int] | None = None  # (length, forward cell, backward cell)
+        for current in layer:
+            if expand_forward:
+                maze.mark_visited(current)
+            depth: int = discovered[current][1] + 1
+            for neighbour in maze.neighbours(current):
+                if neighbour in discovered:
+                    continue
+                if neighbour in others:
+                    length: int = depth + others[neighbour][1]
+                    if best is None or length < best[0]:
+                        best = (length, current, neighbour) if expand_forward else (length, neighbour, current)
+                    continue
+                discovered[neighbour] = (current, depth)
+                next_layer.append(neighbour)
+        if best is not None:
+            _, forward_cell, backward_cell = best
+            path: List[int] = []
+            while forward_cell != -1:
+                # Only marked already when the forward side was the one expanding.
+                maze.mark_visited(forward_cell)
+                path.append(forward_cell)
+                forward_cell = forward[forward_cell][0]
+            path.reverse()
+            while backward_cell != -1:
+                maze.mark_visited(backward_cell)
+                path.append(backward_cell)
+                backward_cell = backward[backward_cell][0]
+            return path
+        if expand_forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+    # No exit can be reached, the forward side has to visit the rest of the cells reachable from the start.
+    flood: Deque[int] = deque(forward_layer)
+    while flood:
+        current = flood.popleft()
+        maze.mark_visited(current)
+        for neighbour in maze.neighbours(current):
+            if neighbour not in forward:
+                forward[neighbour] = (current, forward[current][1] + 1)
+                flood.append(neighbour)
+    return None
+
+
+def a_star_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Finds a shortest path using A* with the Manhattan distance to the nearest exit as heuristic.
+    The heuristic is consistent, so each cell is expanded at most once.
+
+    Complexity:
+        Best Case O(E) when the start is an exit, where E is the number of exits.
+        Worst Case O(N * (E + log N)) where N is the number of cells in the maze.
+    """
+    cols: int = maze.cols
+    exits: List[tuple[int, int]] = [(position.row, position.col) for position in maze.end_positions]
+
+    def heuristic(index: int) -> int:
+        row, col = divmod(index, cols)
+        return min(abs(row - exit_row) + abs(col - exit_col) for exit_row, exit_col in exits)
+
+    parents: Dict[int, int] = {start: -1}
+    costs: Dict[int, int] = {start: 0}
+    expanded: set[int] = set()
+    # Ties on f are broken towards the larger g (deeper cells), then by insertion order.
+    frontier: List[tuple[int, int, int, int]] = [(heuristic(start), 0, 0, start)]
+    counter: int = 1
+    while frontier:
+        _, negative_cost, _, current = heapq.heappop(frontier)
+        if current in expanded:
+            continue
+        expanded.add(current)
+        maze.mark_visited(current)
+        if maze.is_exit(current):
+            return reconstruct_path(parents, current)
+        cost: int = -negative_cost + 1
+        for neighbour in maze.neighbours(current):
+            if neighbour not in expanded and cost < costs.get(neighbour, cost + 1):
+                costs[neighbour] = cost
+                parents[neighbour] = current
+                heapq.heappush(frontier, (cost + heuristic(neighbour), -cost, counter, neighbour))
+                counter += 1
+    return None
+
+
+def distance_field_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Walks from the start to an exit by always stepping to a neighbour one move closer to an exit,
+    according to `Maze.exit_distances`. Only the cells on the path are visited.
+
+    Complexity:
+        Best Case O(1) when the start has no way out.
+        Worst Case O(L) where L is the length of the path, once the distance field is built.
+    """
+    distances = maze.exit_distances
+    remaining: int = distances[start]
+    if remaining == -1:
+        return None
+    path: List[int] = [start]
+    maze.mark_visited(start)
+    current: int = start
+    while remaining > 0:
+        remaining -= 1
+        for neighbour in maze.neighbours(current):
+            if distances[neighbour] == remaining:
+                current = neighbour
+                break
+        path.append(current)
+        maze.mark_visited(current)
+    return path
+
+
+def wavefront_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Breadth first search expanding the whole frontier at once with NumPy array operations.
+    The passable cells, the frontier and the cells seen so far are boolean arrays shaped like the
+    maze, each step shifts the frontier one cell in every direction and records the direction each
+    newly reached cell was entered from in a uint8 array, which is walked back to build the path.
+    Finds a shortest path, visits the same cells as breadth_first_search would up to the layer the
+    exit is found in, and falls back to breadth_first_search when NumPy is not installed.
+
+    Complexity:
+        Best Case O(1) when the start is an exit.
+        Worst Case O(N * D) array work, where N is the number of cells in the maze and D the
+        distance to the nearest exit (or the depth of the reachable region if there is none),
+        but only O(D + L) Python level steps, where L is the length of the path.
+    """
+    if np is None:
+        return breadth_first_search(maze, start)
+    rows, cols = maze.rows, maze.cols
+    # Cells with no moves can only be part of a path when they are the start.
+    passable = np.frombuffer(bytes(maze.neighbour_masks), dtype=np.uint8).reshape(rows, cols) != 0
+    passable.flat[start] = True
+    exits = np.zeros((rows, cols), dtype=bool)
+    for position in maze.end_positions:
+        exits[position.row, position.col] = True
+
+    # Direction codes, 0 means not reached (or the start), otherwise the move made to enter the cell.
+    up, down, left, right = 1, 2, 3, 4
+    entered_by = np.zeros((rows, cols), dtype=np.uint8)
+    seen = np.zeros((rows, cols), dtype=bool)
+    frontier = np.zeros((rows, cols), dtype=bool)
+    frontier.flat[start] = True
+    seen |= frontier
+    found: int = -1
+    while frontier.any():
+        reached = frontier & exits
+        if reached.any():
+            found = int(np.flatnonzero(reached)[0])
+            break
+        reachable = passable & ~seen
+        step = np.zeros((rows, cols), dtype=bool)
+        for code, target, source in ((up, np.s_[:-1, :], np.s_[1:, :]), (down, np.s_[1:, :], np.s_[:-1, :]),
+                                     (left, np.s_[:, :-1], np.s_[:, 1:]), (right, np.s_[:, 1:], np.s_[:, :-1])):
+            entered = frontier[source] & reachable[target] & ~step[target]
+            entered_by[target][entered] = code
+            step[target] |= entered
+        seen |= step
+        frontier = step
+
+    # Every cell seen before the last layer was expanded, as was the exit that was reached.
+    expanded = seen & ~frontier
+    if found != -1:
+        expanded.flat[found] = True
+    maze.mark_visited_bitmap(np.packbits(expanded.ravel(), bitorder='little').tobytes())
+    if found == -1:
+        return None
+
+    offsets: Dict[int, int] = {up: cols, down: -cols, left: 1, right: -1}
+    path: List[int] = [found]
+    current: int = found
+    while current != start:
+        current += offsets[int(entered_by.flat[current])]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def jump_point_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    A* over jump points on the 4-connected grid, using the same heuristic as a_star_search.
+
+    Straight runs of open cells are skipped instead of being expanded cell by cell:
+    - a horizontal jump stops at an exit, or at a cell with a forced neighbour, that is an open
+      cell above or below it whose cell behind (against the direction of travel) is blocked.
+    - a vertical jump stops at an exit, or at a cell from which a horizontal jump, either way,
+      reaches a jump point.
+    Only jump points are expanded, the path returned is expanded back into single steps between
+    consecutive jump points. The jump points expanded and the cells of the path are marked as visited.
+
+    Complexity:
+        Best Case O(E) when the start is an exit, where E is the number of exits.
+        Worst Case O(N^2 * E) where N is the number of cells in the maze, as vertical jumps scan
+        horizontally at every step, though on open rooms far fewer cells are expanded than by BFS.
+    """
+    cols: int = maze.cols
+    masks: bytearray = maze.neighbour_masks
+    (up_bit, up), (down_bit, down), (left_bit, left), (right_bit, right) = maze.neighbour_offsets
+    exits: List[tuple[int, int]] = [(position.row, position.col) for position in maze.end_positions]
+
+    def heuristic(index: int) -> int:
+        row, col = divmod(index, cols)
+        return min(abs(row - exit_row) + abs(col - exit_col) for exit_row, exit_col in exits)
+
+    def jump_horizontal(index: int, step_bit: int, step: int) -> int:
+        # Moving left or right, behind is the opposite horizontal offset.
+        while masks[index] & step_bit:
+            index += step
+            if maze.is_exit(index):
+                return index
+            mask: int = masks[index]
+            if mask & up_bit and not masks[index + up - step] & down_bit:
+                return index
+            if mask & down_bit and not masks[index + down - step] & up_bit:
+                return index
+        return -1
+
+    def jump_vertical(index: int, step_bit: int, step: int) -> int:
+        while masks[index] & step_bit:
+            index += step
+            if maze.is_exit(index):
+                return index
+            if jump_horizontal(index, left_bit, left) != -1 or jump_horizontal(index, right_bit, right) != -1:
+                return index
+        return -1
+
+    parents: Dict[int, int] = {start: -1}
+    costs: Dict[int, int] = {start: 0}
+    expanded: set[int] = set()
+    frontier: List[tuple[int, int, int, int]] = [(heuristic(start), 0, 0, start)]
+    counter: int = 1
+    found: int = -1
+    while frontier:
+        _, negative_cost, _, current = heapq.heappop(frontier)
+        if current in expanded:
+            continue
+        expanded.add(current)
+        maze.mark_visited(current)
+        if maze.is_exit(current):
+            found = current
+            break
+        for jump in (jump_horizontal(current, left_bit, left), jump_horizontal(current, right_bit, right),
+                     jump_vertical(current, up_bit, up), jump_vertical(current, down_bit, down)):
+            if jump == -1 or jump in expanded:
+                continue
+            current_row, current_col = divmod(current, cols)
+            jump_row, jump_col = divmod(jump, cols)
+            cost: int = -negative_cost + abs(current_row - jump_row) + abs(current_col - jump_col)
+            if cost < costs.get(jump, cost + 1):
+                costs[jump] = cost
+                parents[jump] = current
+                heapq.heappush(frontier, (cost + heuristic(jump), -cost, counter, jump))
+                counter += 1
+    if found == -1:
+        return None
+
+    # Expand the jump points back into single steps, consecutive jump points share a row or column.
+    jump_points: List[int] = reconstruct_path(parents, found)
+    path: List[int] = [start]
+    for target in jump_points[1:]:
+        current = path[-1]
+        step: int = (1 if target > current else -1) * (1 if current // cols == target // cols else cols)
+        while current != target:
+            current += step
+            maze.mark_visited(current)
+            path.append(current)
+    return path
+
+
+def hierarchical_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Plans over the cached clusters of `Maze.cluster_graph` and refines the plan into single steps,
+    see algorithms/hierarchical_search.py. Only the cells of the path returned are visited.
+    The path is not necessarily the shortest.
+
+    Complexity:
+        Best Case O(S^2) when the start is an exit, where S is the cluster size.
+        Worst Case O(X * S^2 + V log V + L * S^2) where X is the number of exits, V the number
+        of entrance cells and L the length of the path, once the cluster graph is built.
+    """
+    path: List[int] | None = maze.cluster_graph().find_path(start)
+    for index in path or []:
+        maze.mark_visited(index)
+    return path
+
+
+def incremental_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Asks the D* Lite planner of `Maze.incremental_planner` for a shortest path,
+    see algorithms/incremental_search.py. Only the cells of the path returned are visited.
+
+    Complexity:
+        Best Case O(L) where L is the length of the path, when the maze has not changed since the last query.
+        Worst Case O(N log N) where N is the number of cells in the maze.
+    """
+    planner: IncrementalPlanner = maze.incremental_planner()
+    if planner.start != start:
+        planner.move_to(start)
+    path: List[int] | None = planner.path()
+    for index in path or []:
+        maze.mark_visited(index)
+    return path
+
+
+def junction_search(maze: Maze, start: int) -> List[int] | None:
+    """
+    Dijkstra's algorithm over the contracted corridors of `Maze.junction_graph`, see
+    algorithms/junction_graph.py. The junctions settled and the cells of the path are visited.
+
+    Complexity:
+        Best Case O(L) where L is the length of the path, when the start is an exit.
+        Worst Case O(N + J log J) where N is the number of cells in the maze and J the number of junctions.
+    """
+    path, settled = maze.junction_graph.find_path(start)
+    for index in settled + (path or []):
+        maze.mark_visited(index)
+    return path
+
+
+ENGINES: Dict[str, SearchEngine] = {
+    "bfs": breadth_first_search,
+    "dfs": depth_first_search,
+    "bidirectional": bidirectional_search,
+    "astar": a_star_search,
+    "distance_field": distance_field_search,
+    "numpy": wavefront_search,
+    "jps": jump_point_search,
+    "hierarchical": hierarchical_search,
+    "incremental": incremental_search,
+    "junction": junction_search,
+}
+
+# Engines that see the maze only through its neighbour masks, so they can search the masks of
+# `Maze.dead_end_fill` instead. The others rely on caches built from the full maze.
+DEAD_END_ENGINES: frozenset[str] = frozenset({"bfs", "dfs", "bidirectional", "astar", "numpy", "jps"})
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+"""
+Treasure maximising routes through the hollows of a maze.
+
+A route leaves the start, visits some hollows one after another and ends at an exit.
+Every leg between two stops is a shortest walk that passes no other hollow, so the
+hollows `Maze.take_treasures` meets along the route are exactly the stops, in order.
+The distances of those legs, between the start, every hollow and every exit, only depend
+on the layout and are found once by one breadth first search per start or hollow.
+
+Routes are searched depth first, scoring each one by replaying the choices
+`take_treasures` would make with `RankedHollows`. A branch is cut when
+it can't reach an exit within the step budget, or when the value collected so far plus
+the most valuable treasure that still fits in each hollow not yet visited can't beat the
+best route found. Each hollow is visited at most once.
+"""
+
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Tuple
+
+from hollows import Hollow
+from treasure import Treasure
+
+if TYPE_CHECKING:
+    from maze import Maze
+
+
+class RankedHollows:
+    """
+    Replays the choices of `Hollow.get_optimal_treasure` without changing any hollow.
+    Each hollow is ranked once, from its best value / weight ratio down, and treasures are
+    taken by adding them to a set of taken treasures instead of removing them from the hollow.
+    Hollows shared between cells (the mystical hollow) share one ranking.
+    """
+
+    def __init__(self) -> None:
+        self._rankings: Dict[int, List[Treasure]] = {}
+
+    def ranking(self, hollow: Hollow) -> List[Treasure]:
+        """
+        Complexity:
+            Best Case Complexity: O(1) once hollow is ranked.
+            Worst Case Complexity: O(hollow.ranked_treasures) the first time.
+        """
+        if id(hollow) not in self._rankings:
+            self._rankings[id(hollow)] = hollow.ranked_treasures()
+        return self._rankings[id(hollow)]
+
+    def choose(self, hollow: Hollow, capacity: int, taken: set[int]) -> Treasure | None:
+        """
+        Args:
+            hollow(Hollow): The hollow to take from.
+            capacity(int): The backpack capacity left.
+            taken(set[int]): The ids of the treasures already taken.
+
+        Returns:
+            Treasure | None - The treasure get_optimal_treasure would take, None if nothing fits.
+
+        Complexity:
+            Best Case Complexity: O(1) when the best ranked treasure fits.
+            Worst Case Complexity: O(n) where n is the number of treasures in the hollow.
+        """
+        for treasure in self.ranking(hollow):
+            if id(treasure) not in taken and treasure.weight <= capacity:
+                return treasure
+        return None
+
+    def most_valuable(self, hollow: Hollow, capacity: int, taken: set[int]) -> int:
+        """
+        Returns:
+            int - The greatest value of a treasure not yet taken from hollow that fits in capacity, 0 if none.
+
+        Complexity:
+            Best Case Complexity: O(n) where n is the number of treasures in the hollow.
+            Worst Case Complexity: O(n) where n is the number of treasures in the hollow.
+        """
+        return max((treasure.value for treasure in self.ranking(hollow)
+                    if id(treasure) not in taken and treasure.weight <= capacity), default=0)
+
+
+class RouteDistances:
+    """ The number of moves of every leg a route can take, see the module documentation. """
+
+    def __init__(self, maze: Maze) -> None:
+        """
+        Args:
+            maze(Maze): The maze to measure.
+
+        Complexity:
+            Best Case Complexity: O(H * N) where H is the number of hollows and N the number of cells in the maze.
+            Worst Case Complexity: O(H * N) where H is the number of hollows and N the number of cells in the maze.
+        """
+        self.maze: Maze = maze
+        cells: int = maze.rows * maze.cols
+        self.start: int = maze.start_position.pack(maze.cols)
+        self.hollows: List[int] = [index for index in range(cells) if maze._is_hollow(index)]
+        self.exits: List[int] = [position.pack(maze.cols) for position in maze.end_positions]
+        # distances[source][target] for every source (the start or a hollow) and every hollow or exit it can reach.
+        self.distances: Dict[int, Dict[int, int]] = {}
+        # The fewest moves from each source to any exit, only for sources that have a way out.
+        self.exit_distances: Dict[int, int] = {}
+        for source in [self.start] + self.hollows:
+            reached, _ = self.search(source)
+            self.distances[source] = {target: reached[target] for target in self.hollows + self.exits
+                                      if reached[target] != -1 and target != source}
+            to_exits: List[int] = [reached[target] for target in self.exits if reached[target] != -1]
+            if to_exits:
+                self.exit_distances[source] = min(to_exits)
+
+    def search(self, source: int) -> Tuple[array, array]:
+        """
+        Breadth first search from source that never walks through a hollow other than source.
+
+        Returns:
+            Tuple[array, array] - The number of moves to and the parent of every cell, -1 where unreached.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        cells: int = self.maze.rows * self.maze.cols
+        distances: array = array('i', [-1]) * cells
+        parents: array = array('i', [-1]) * cells
+        distances[source] = 0
+        queue: Deque[int] = deque([source])
+        while queue:
+            current: int = queue.popleft()
+            if current != source and self.maze._is_hollow(current):
+                continue
+            for neighbour in self.maze.neighbours(current):
+                if distances[neighbour] == -1:
+                    distances[neighbour] = distances[current] + 1
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+        return distances, parents
+
+    def leg(self, source: int, target: int) -> List[int]:
+        """
+        Returns:
+            List[int] - A shortest walk from source to target passing no other hollow, without source.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        _, parents = self.search(source)
+        steps: List[int] = []
+        while target != source:
+            steps.append(target)
+            target = parents[target]
+        steps.reverse()
+        return steps
+
+
+def plan_route(maze: Maze, distances: RouteDistances, backpack_capacity: int,
+               max_steps: int | None = None) -> Tuple[List[int], List[Treasure]] | None:
+    """
+    Finds the route collecting the most treasure value, ties going to the fewest moves,
+    see the module documentation.
+
+    Args:
+        maze(Maze): The maze to plan in, its hollows are not changed.
+        distances(RouteDistances): The leg distances of maze.
+        backpack_capacity(int): The maximum weight that can be carried.
+        max_steps(int | None): The most moves the route may take, None for no limit.
+
+    Returns:
+        Tuple[List[int], List[Treasure]] | None - The cell indices of the best route and the treasures
+        `Maze.take_treasures` would take along it, None if no route reaches an exit within max_steps.
+
+    Complexity:
+        Best Case Complexity: O(H * T + N) where H is the number of hollows, T the number of
+        treasures in a hollow and N the number of cells in the maze, when no hollow can be reached.
+        Worst Case Complexity: O(H! * H * T + N) when no branch can be cut.
+    """
+    start: int = distances.start
+    limit: float = float("inf") if max_steps is None else max_steps
+    # The fewest moves to an exit from every cell, walking through hollows or not, never more than any route takes.
+    floor: array = maze.exit_distances
+    if floor[start] == -1 or floor[start] > limit:
+        return None
+    ranked: RankedHollows = RankedHollows()
+    hollows: Dict[int, Hollow] = {index: maze.hollow_at(index) for index in distances.hollows}
+    taken: set[int] = set()
+
+    def bound(capacity: int) -> int:
+        # Each hollow not yet visited gives at most its most valuable treasure that still fits.
+        return sum(ranked.most_valuable(hollow, capacity, taken) for index, hollow in hollows.items() if index not in stops)
+
+    best_stops: List[int] | None = None
+    best_score: Tuple[int, int] = (-1, 0)
+    stops: List[int] = []
+
+    def explore(current: int, steps: int, capacity: int, value: int) -> None:
+        nonlocal best_stops, best_score
+        # Routes may only end here when the last leg to an exit passes no other hollow.
+        if current in distances.exit_distances and steps + distances.exit_distances[current] <= limit:
+            score: Tuple[int, int] = (value, -(steps + distances.exit_distances[current]))
+            if score > best_score:
+                best_stops, best_score = list(stops), score
+        most: int = value + bound(capacity)
+        if most < best_score[0] or (most == best_score[0] and steps + floor[current] >= -best_score[1]):
+            return
+        for index, distance in distances.distances[current].items():
+            if index not in hollows or index in stops or floor[index] == -1 or steps + distance + floor[index] > limit:
+                continue
+            treasure: Treasure | None = ranked.choose(hollows[index], capacity, taken)
+            stops.append(index)
+            if treasure is not None:
+                taken.add(id(treasure))
+                explore(index, steps + distance, capacity - treasure.weight, value + treasure.value)
+                taken.discard(id(treasure))
+            else:
+                explore(index, steps + distance, capacity, value)
+            stops.pop()
+
+    explore(start, 0, backpack_capacity, 0)
+    if best_stops is None:
+        return None
+
+    path: List[int] = [start]
+    treasures: List[Treasure] = []
+    capacity: int = backpack_capacity
+    for index in best_stops:
+        path.extend(distances.leg(path[-1], index))
+        treasure = ranked.choose(hollows[index], capacity, taken)
+        if treasure is not None:
+            taken.add(id(treasure))
+            treasures.append(treasure)
+            capacity -= treasure.weight
+    reachable: Dict[int, int] = distances.distances[path[-1]]
+    nearest: int = min((exit_index for exit_index in distances.exits if exit_index in reachable), key=reachable.get)
+    path.extend(distances.leg(path[-1], nearest))
+    return path, treasures
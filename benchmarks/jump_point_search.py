@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+"""
+Compares the number of cells expanded (marked as visited) and the time taken by the bfs,
+astar and jps engines of `Maze.find_way_out` on an open room and on a winding corridor.
+
+Usage (from the repository root):
+    python -m benchmarks.jump_point_search [size]
+"""
+
+import sys
+import time
+from typing import List
+
+from maze import Maze, Position
+
+
+def open_room(size: int) -> Maze:
+    """ A size x size room surrounded by walls, start in one corner and the exit in the opposite one. """
+    walls: List[Position] = [Position(row, col) for row in range(size) for col in range(size)
+                             if row in (0, size - 1) or col in (0, size - 1)]
+    return Maze(Position(1, 1), [Position(size - 2, size - 2)], walls, [], size, size, compact=True)
+
+
+def corridor(size: int) -> Maze:
+    """ A size x size maze made of one corridor winding back and forth across every other row. """
+    walls: List[Position] = []
+    for row in range(size):
+        for col in range(size):
+            border: bool = row in (0, size - 1) or col in (0, size - 1)
+            # Every odd wall row leaves a gap at alternating ends to link the corridor rows.
+            divider: bool = row % 2 == 0 and col != (size - 2 if row % 4 == 2 else 1)
+            if border or divider:
+                walls.append(Position(row, col))
+    last_row: int = size - 2 if size % 2 == 0 else size - 3
+    exit_col: int = 1 if (last_row // 2) % 2 == 1 else size - 2
+    return Maze(Position(1, 1), [Position(last_row, exit_col)], walls, [], size, size, compact=True)
+
+
+def expanded_cells(maze: Maze) -> int:
+    return sum(cell.visited for row in maze.grid for cell in row)
+
+
+def benchmark(size: int = 200) -> None:
+    for name, build in (("open room", open_room), ("corridor", corridor)):
+        print(f"{name} ({size} x {size})")
+        for engine in ("bfs", "astar", "jps"):
+            maze: Maze = build(size)
+            start: float = time.perf_counter()
+            path: List[Position] | None = maze.find_way_out(engine)
+            elapsed: float = time.perf_counter() - start
+            print(f"    {engine:>5}: {expanded_cells(maze):>8} expanded, path length {len(path) if path else None}, {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
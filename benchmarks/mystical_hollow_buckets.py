@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+"""
+Compares the weight bucketed `HeapForest` behind `MysticalHollow` with a single max ratio
+heap, which pops and pushes back every too heavy treasure until one fits. Both drain the
+same treasures with backpack capacities drawn from small, uniform and large distributions
+and must hand out the same treasures in the same order.
+
+Usage (from the repository root):
+    python -m benchmarks.mystical_hollow_buckets [treasures]
+"""
+
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from data_structures.heap import MaxHeap
+from data_structures.linked_stack import LinkedStack
+from heap_forest import Entry, HeapForest
+from treasure import Treasure
+
+
+def single_heap_take(heap: MaxHeap[Entry], capacity: int) -> Entry | None:
+    """ The single heap search, O(n log n) worst case when most treasures are too heavy. """
+    too_heavy: LinkedStack[Entry] = LinkedStack()
+    found: Entry | None = None
+    while len(heap) > 0:
+        entry: Entry = heap.get_max()
+        if entry[2].weight <= capacity:
+            found = entry
+            break
+        too_heavy.push(entry)
+    while not too_heavy.is_empty():
+        heap.add(too_heavy.pop())
+    return found
+
+
+def benchmark(size: int = 1000) -> None:
+    max_weight: int = 4 * size
+    # Heavier treasures tend to have better ratios, the case that makes small backpacks slow.
+    weights: List[int] = random.sample(range(1, max_weight + 1), size)
+    entries: List[Entry] = [((weight + random.randint(0, size)) / weight * weight ** 0.5, -position, Treasure(0, weight))
+                            for position, weight in enumerate(weights)]
+    distributions: Dict[str, Callable[[], int]] = {
+        "small": lambda: random.randint(1, max_weight // 20),
+        "uniform": lambda: random.randint(1, max_weight),
+        "large": lambda: max_weight,
+    }
+    takes: int = size // 2
+    print(f"{size} treasures, {takes} takes per run")
+    for name, capacity in distributions.items():
+        capacities: List[int] = [capacity() for _ in range(takes)]
+
+        heap: MaxHeap[Entry] = MaxHeap.heapify(list(entries))
+        start: float = time.perf_counter()
+        expected: List[Entry | None] = [single_heap_take(heap, backpack) for backpack in capacities]
+        single: float = time.perf_counter() - start
+
+        forest: HeapForest = HeapForest(list(entries))
+        start = time.perf_counter()
+        taken: List[Entry | None] = [forest.take_best(backpack) for backpack in capacities]
+        bucketed: float = time.perf_counter() - start
+
+        print(f"    {name:>7}: single heap {single * 1000:>9.1f}ms, heap forest {bucketed * 1000:>8.1f}ms, "
+              f"same treasures: {taken == expected}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
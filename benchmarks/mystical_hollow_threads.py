@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+"""
+Stress test of `ConcurrentMysticalHollow`: a growing number of explorer threads drain one
+shared hollow with random backpack capacities. Reports the takes per second for each
+thread count and checks that every treasure was handed out exactly once.
+
+Usage (from the repository root):
+    python -m benchmarks.mystical_hollow_threads [treasures]
+"""
+
+import random
+import sys
+import threading
+import time
+from typing import List
+
+from hollows import ConcurrentMysticalHollow
+from treasure import Treasure
+
+
+def shared_hollow(size: int) -> ConcurrentMysticalHollow:
+    """ A hollow holding size treasures with distinct ratios. """
+    hollow: ConcurrentMysticalHollow = ConcurrentMysticalHollow()
+    hollow.treasures = [Treasure(value, weight) for value, weight in
+                        zip(random.sample(range(1, 10 * size), size), random.sample(range(1, 10 * size), size))]
+    hollow.restructure_hollow()
+    return hollow
+
+
+def explorer(hollow: ConcurrentMysticalHollow, max_weight: int, seed: int, taken: List[Treasure]) -> None:
+    rng: random.Random = random.Random(seed)
+    while True:
+        treasure: Treasure | None = hollow.get_optimal_treasure(rng.randint(1, max_weight))
+        # A small backpack may not fit anything left, fall back to one that fits everything.
+        if treasure is None:
+            treasure = hollow.get_optimal_treasure(max_weight)
+        if treasure is None:
+            return
+        taken.append(treasure)
+
+
+def benchmark(size: int = 2000) -> None:
+    print(f"{size} treasures shared by every thread")
+    for threads in (1, 2, 4, 8):
+        hollow: ConcurrentMysticalHollow = shared_hollow(size)
+        everything: List[Treasure] = hollow.ranked_treasures()
+        max_weight: int = max(treasure.weight for treasure in everything)
+        taken: List[List[Treasure]] = [[] for _ in range(threads)]
+        workers: List[threading.Thread] = [threading.Thread(target=explorer, args=(hollow, max_weight, seed, taken[seed]))
+                                           for seed in range(threads)]
+        start: float = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed: float = time.perf_counter() - start
+
+        handed_out: List[Treasure] = [treasure for share in taken for treasure in share]
+        exactly_once: bool = (len(handed_out) == size and len({id(treasure) for treasure in handed_out}) == size
+                              and {id(treasure) for treasure in handed_out} == {id(treasure) for treasure in everything})
+        print(f"    {threads} threads: {size / elapsed:>10.0f} takes/s, {elapsed * 1000:.1f}ms, "
+              f"each treasure handed out exactly once: {exactly_once}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
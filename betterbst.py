@@ -9,7 +9,7 @@ I = TypeVar('I')
 
 
 class BetterBST(BinarySearchTree[K, I]):
-    def __init__(self, elements: List[Tuple[K, I]]) -> None:
+    def __init__(self, elements: List[Tuple[K, I]], presorted: bool = False) -> None:
         """
         Initialiser for the BetterBST class.
         We assume that the all the elements that will be inserted
@@ -23,13 +23,15 @@ class BetterBST(BinarySearchTree[K, I]):
 
         Args:
             elements(List[tuple[K, I]]): The elements to be inserted into the tree.
+            presorted(bool): Whether elements are already sorted by key, skipping the sort.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n * log(n) * CompK)
+            Worst Case Complexity: O(n * log(n) * CompK)
+            where n is the number of elements and CompK the cost of comparing two keys.
         """
         super().__init__()
-        new_elements: List[Tuple[K, I]] = self.__sort_elements(elements)
+        new_elements: List[Tuple[K, I]] = elements if presorted else self.__sort_elements(elements)
         self.__build_balanced_tree(new_elements)
 
     def __sort_elements(self, elements: List[Tuple[K, I]]) -> List[Tuple[K, I]]:
@@ -45,10 +47,27 @@ class BetterBST(BinarySearchTree[K, I]):
             list(Tuple[K, I]]) - elements after being sorted.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n * log(n) * CompK)
+            Worst Case Complexity: O(n * log(n) * CompK)
+            where n is the number of elements and CompK the cost of comparing two keys.
         """
-        return sorted(elements,key=lambda x:x[0])
+        if len(elements) <= 1:
+            return elements
+        mid: int = len(elements) // 2
+        left: List[Tuple[K, I]] = self.__sort_elements(elements[:mid])
+        right: List[Tuple[K, I]] = self.__sort_elements(elements[mid:])
+        merged: List[Tuple[K, I]] = []
+        i, j = 0, 0
+        while i < len(left) and j < len(right):
+            if right[j][0] < left[i][0]:
+                merged.append(right[j])
+                j += 1
+            else:
+                merged.append(left[i])
+                i += 1
+        merged.extend(left[i:])
+        merged.extend(right[j:])
+        return merged
 
     def __build_balanced_tree(self, elements: List[Tuple[K, I]]) -> None:
         """
@@ -63,11 +82,14 @@ class BetterBST(BinarySearchTree[K, I]):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n * log(n) * CompK)
+            Worst Case Complexity: O(n * log(n) * CompK)
+            where n is the number of elements and CompK the cost of comparing two keys.
 
         Justification:
-            TODO
+            Each element is inserted at the middle of its slice, so the tree built has depth
+            O(log(n)) and every insertion walks at most that many nodes. Slicing the halves
+            costs O(n) per level of recursion, O(n * log(n)) over the O(log(n)) levels.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n * log(n))
@@ -83,9 +105,3 @@ class BetterBST(BinarySearchTree[K, I]):
 
         self.__build_balanced_tree(elements[:mid])#left sub tree
         self.__build_balanced_tree(elements[mid+1:])# right subtree
-
-
-
-
-elements=[(1,1),(9,9),(4,4),(11,11),(2,2),(7,7),(8,8)]
-BetterBST(elements).draw()
\ No newline at end of file
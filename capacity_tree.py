@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+"""
+A ratio keyed tree of treasures that can find the best treasure fitting a backpack in O(log n).
+
+Every node also stores the smallest treasure weight of its subtree. Looking for the greatest
+key whose treasure weighs at most the capacity then follows one branch from the root: go right
+while the right subtree holds something light enough, else take the node itself if it fits, else
+go left. Inserting and deleting keep the tree an AVL tree (children heights differ by at most
+one), so the tree stays O(log n) deep however many treasures are taken or put back.
+"""
+
+from typing import List, Tuple, TypeVar
+
+from betterbst import BetterBST
+from data_structures.node import TreeNode
+from treasure import Treasure
+
+K = TypeVar('K')
+
+
+class CapacityNode(TreeNode[K, Treasure]):
+    """ A tree node that also knows the height and the lightest treasure of its subtree. """
+
+    def __init__(self, key: K, item: Treasure, depth: int = 1) -> None:
+        super().__init__(key, item, depth)
+        self.height: int = 1
+        self.min_weight: int = item.weight
+
+
+def _height(node: CapacityNode | None) -> int:
+    return 0 if node is None else node.height
+
+
+def _min_weight(node: CapacityNode | None) -> float:
+    return float("inf") if node is None else node.min_weight
+
+
+class CapacityTree(BetterBST[K, Treasure]):
+    """
+    A balanced tree of treasures keyed by a ratio, see the module documentation.
+
+    The depth of a node is the depth it was inserted at and isn't updated by rotations,
+    the height kept in every node is what keeps the tree balanced.
+    """
+
+    def __init__(self, elements: List[Tuple[K, Treasure]], presorted: bool = False) -> None:
+        """
+        Args:
+            elements(List[Tuple[K, Treasure]]): The key, treasure pairs in the tree, may be empty.
+            presorted(bool): Whether elements are already sorted by key, skipping the sort.
+
+        Complexity:
+            Best Case Complexity: O(n * log(n) * CompK)
+            Worst Case Complexity: O(n * log(n) * CompK)
+            where n is the number of elements and CompK the cost of comparing two keys.
+        """
+        super().__init__(elements, presorted)
+
+    def best_fit(self, capacity: int) -> CapacityNode | None:
+        """
+        Args:
+            capacity(int): The greatest weight allowed.
+
+        Returns:
+            CapacityNode | None - The node with the greatest key whose treasure weighs at most capacity,
+            None if every treasure is heavier.
+
+        Complexity:
+            Best Case Complexity: O(1) when nothing fits.
+            Worst Case Complexity: O(log(n)) where n is the number of treasures in the tree.
+        """
+        current: CapacityNode | None = self.root
+        if _min_weight(current) > capacity:
+            return None
+        while True:
+            if _min_weight(current.right) <= capacity:
+                current = current.right
+            elif current.item.weight <= capacity:
+                return current
+            else:
+                current = current.left
+
+    def lightest_weight(self) -> int | None:
+        """
+        Returns:
+            int | None - The weight of the lightest treasure in the tree, None if it is empty.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return None if self.root is None else self.root.min_weight
+
+    def insert_aux(self, current: CapacityNode | None, key: K, item: Treasure, current_depth: int) -> CapacityNode:
+        """
+            Inserts the item and rebalances every node on the way back up
+            :complexity best: O(CompK) inserts the item at the root.
+            :complexity worst: O(CompK * log(n)) where n is the number of treasures in the tree
+        """
+        if current is None:
+            self.length += 1
+            return CapacityNode(key, item, current_depth)
+        elif key < current.key:
+            current.left = self.insert_aux(current.left, key, item, current_depth + 1)
+        elif key > current.key:
+            current.right = self.insert_aux(current.right, key, item, current_depth + 1)
+        else:
+            raise ValueError('Inserting duplicate item')
+        return self._rebalance(current)
+
+    def delete_aux(self, current: CapacityNode | None, key: K) -> CapacityNode | None:
+        """
+            Deletes the node with the key and rebalances every node on the way back up
+            :complexity best: O(CompK) deletes a root with at most one child.
+            :complexity worst: O(CompK * log(n)) where n is the number of treasures in the tree
+        """
+        if current is None:
+            raise ValueError('Deleting non-existent item')
+        elif key < current.key:
+            current.left = self.delete_aux(current.left, key)
+        elif key > current.key:
+            current.right = self.delete_aux(current.right, key)
+        elif current.left is None or current.right is None:
+            self.length -= 1
+            return current.left if current.right is None else current.right
+        else:
+            succ: CapacityNode = self.get_successor(current)
+            current.key = succ.key
+            current.item = succ.item
+            current.right = self.delete_aux(current.right, succ.key)
+        return self._rebalance(current)
+
+    def _update(self, node: CapacityNode) -> None:
+        """ Recomputes the height and lightest weight of node from its children, O(1). """
+        node.height = 1 + max(_height(node.left), _height(node.right))
+        node.min_weight = min(node.item.weight, _min_weight(node.left), _min_weight(node.right))
+
+    def _rotate_left(self, node: CapacityNode) -> CapacityNode:
+        pivot: CapacityNode = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node: CapacityNode) -> CapacityNode:
+        pivot: CapacityNode = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node: CapacityNode) -> CapacityNode:
+        """
+        Restores the AVL property at node, whose children are balanced and differ in height by at most two.
+
+        Returns:
+            CapacityNode - The root of the rebalanced subtree.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._update(node)
+        balance: int = _height(node.left) - _height(node.right)
+        if balance > 1:
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
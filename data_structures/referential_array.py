@@ -16,6 +16,7 @@ checked by self.array[index].
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
+from copy import deepcopy
 from ctypes import py_object
 from typing import Generic, TypeVar
 
@@ -33,6 +34,16 @@ class ArrayR(Generic[T]):
         self.array = (length * py_object)()  # initialises the space
         self.array[:] = [None for _ in range(length)]
 
+    def __deepcopy__(self, memo: dict) -> 'ArrayR[T]':
+        """ Returns a new array deep copying every object referenced, ctypes arrays can't be copied directly
+        :complexity: O(length * deepcopy) where deepcopy is the cost of copying one object
+        """
+        copy: ArrayR[T] = ArrayR(len(self))
+        memo[id(self)] = copy
+        for index in range(len(self)):
+            copy[index] = deepcopy(self.array[index], memo)
+        return copy
+
     def __len__(self) -> int:
         """ Returns the length of the array
         :complexity: O(1)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+"""
+A forest of max heaps that splits treasures into buckets by weight.
+
+Bucket b holds the treasures weighing from 2^b to 2^(b+1) - 1 kg, each bucket is a MaxHeap
+ordered by value / weight ratio. For a backpack of capacity c every bucket below the one c
+falls in only holds treasures that fit, so the best of them is the best of their tops. Only
+the bucket c falls in mixes treasures that fit with ones that don't; it is searched the way a
+single heap would be, popping too heavy treasures and pushing them back, but the search stops
+as soon as the ratios popped can't beat the best top already found.
+"""
+
+from typing import Iterator, List, Tuple
+
+from data_structures.heap import MaxHeap
+from data_structures.linked_stack import LinkedStack
+from data_structures.referential_array import ArrayR
+from treasure import Treasure
+
+# (value / weight ratio, tie breaker, treasure), compared as a tuple so treasures are never compared.
+Entry = Tuple[float, int, Treasure]
+
+
+def bucket_of(weight: int) -> int:
+    """ The bucket of a treasure weighing weight kg, O(1). """
+    return max(weight, 1).bit_length() - 1
+
+
+class HeapForest:
+    """ Weight bucketed max heaps of treasure entries, see the module documentation. """
+
+    def __init__(self, entries: List[Entry]) -> None:
+        """
+        Args:
+            entries(List[Entry]): The entries in the forest, may be empty.
+
+        Complexity:
+            Best Case Complexity: O(n + B)
+            Worst Case Complexity: O(n + B)
+            Where n is the number of entries and B the number of buckets, heapifying each bucket.
+        """
+        self.length: int = len(entries)
+        size: int = 1 + max((bucket_of(entry[2].weight) for entry in entries), default=0)
+        grouped: List[List[Entry]] = [[] for _ in range(size)]
+        for entry in entries:
+            grouped[bucket_of(entry[2].weight)].append(entry)
+        self.buckets: ArrayR[MaxHeap[Entry]] = ArrayR(size)
+        for bucket in range(size):
+            self.buckets[bucket] = MaxHeap.heapify(grouped[bucket])
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Entry]:
+        """ The entries of the forest in no particular order, O(n + B). """
+        for bucket in range(len(self.buckets)):
+            heap: MaxHeap[Entry] = self.buckets[bucket]
+            for k in range(1, len(heap) + 1):
+                yield heap.the_array[k]
+
+    def add(self, entry: Entry) -> None:
+        """
+        Puts back an entry taken from the forest, the forest only ever holds the entries it was built with.
+
+        Complexity:
+            Best Case Complexity: O(1) when the entry doesn't rise.
+            Worst Case Complexity: O(log n) where n is the number of entries in its bucket.
+        """
+        self.buckets[bucket_of(entry[2].weight)].add(entry)
+        self.length += 1
+
+    def take_best(self, capacity: int) -> Entry | None:
+        """
+        Removes the entry with the greatest ratio among those weighing at most capacity.
+
+        Args:
+            capacity(int): The greatest weight allowed.
+
+        Returns:
+            Entry | None - The entry taken, None if every entry is heavier than capacity.
+
+        Complexity:
+            Best Case Complexity: O(B + log n) when the best top is found under the bucket capacity falls in.
+            Worst Case Complexity: O(B + k log k) where k is the number of entries in the bucket
+            capacity falls in, when all but the last of them are too heavy.
+            Where n is the number of entries and B the number of buckets.
+        """
+        limit: int = bucket_of(capacity)
+        best: int = -1
+        for bucket in range(min(limit, len(self.buckets))):
+            heap: MaxHeap[Entry] = self.buckets[bucket]
+            if len(heap) > 0 and (best == -1 or heap.the_array[1] > self.buckets[best].the_array[1]):
+                best = bucket
+
+        found: Entry | None = None
+        if limit < len(self.buckets):
+            heap = self.buckets[limit]
+            too_heavy: LinkedStack[Entry] = LinkedStack()
+            while len(heap) > 0 and (best == -1 or heap.the_array[1] > self.buckets[best].the_array[1]):
+                entry: Entry = heap.get_max()
+                if entry[2].weight <= capacity:
+                    found = entry
+                    break
+                too_heavy.push(entry)
+            while not too_heavy.is_empty():
+                heap.add(too_heavy.pop())
+        if found is None and best != -1:
+            found = self.buckets[best].get_max()
+        if found is not None:
+            self.length -= 1
+        return found
+
+    def lightest_weight(self) -> int | None:
+        """
+        Returns:
+            int | None - The weight of the lightest treasure in the forest, None if it is empty.
+
+        Complexity:
+            Best Case Complexity: O(B) when the first bucket holds one entry.
+            Worst Case Complexity: O(B + k) where k is the number of entries in the lightest bucket.
+            Where B is the number of buckets.
+        """
+        for bucket in range(len(self.buckets)):
+            heap: MaxHeap[Entry] = self.buckets[bucket]
+            if len(heap) > 0:
+                return min(heap.the_array[k][2].weight for k in range(1, len(heap) + 1))
+        return None
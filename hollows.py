@@ -7,11 +7,18 @@ The ban on inbuilt sort methods .sort() or sorted() in this task.
 And ensure your treasure data structure is not banned.
 
 """
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Tuple
 
+from capacity_tree import CapacityNode, CapacityTree
 from config import Tiles
-from treasure import Treasure, generate_treasures
+from data_structures.heap import MaxHeap
+from data_structures.linked_stack import LinkedStack
+from data_structures.node import TreeNode
+from heap_forest import Entry, HeapForest
+from random_gen import RandomGen
+from treasure import Treasure, TreasureBatch, generate_treasures
 
 
 class Hollow(ABC):
@@ -59,7 +66,82 @@ class Hollow(ABC):
         return len(self.treasures)
 
 
-class SpookyHollow(Hollow):
+class Checkpointed:
+    """
+    Checkpoints for the hollows, mixed in beside Hollow. Every treasure taken while a checkpoint
+    is live is recorded in an undo log, rolling back puts them back with `_restore`.
+    """
+
+    # Undo log of the treasures taken since the first live checkpoint, None while there is none.
+    _undo_log: LinkedStack | None = None
+    # The log length of every live checkpoint by token, oldest first, only read while the log isn't None.
+    _checkpoints: dict[int, int] | None = None
+    # The last token handed out, tokens are never reused so a dropped checkpoint stays dropped.
+    _generation: int = 0
+
+    def checkpoint(self) -> int:
+        """
+        Marks the current contents of the hollow so they can be restored with `rollback`.
+        From the first checkpoint on every treasure taken is recorded in an undo log, so taking
+        a checkpoint copies nothing. Checkpoints nest, rolling back to one keeps the earlier ones
+        and drops the ones taken after it. Restructuring the hollow (refilling it) drops every checkpoint.
+
+        Returns:
+            int - The token to pass to rollback.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self._undo_log is None:
+            self._undo_log = LinkedStack()
+            self._checkpoints = {}
+        self._generation += 1
+        self._checkpoints[self._generation] = len(self._undo_log)
+        return self._generation
+
+    def rollback(self, token: int) -> None:
+        """
+        Puts back every treasure taken since the checkpoint token was returned by.
+        The checkpoint stays live, every checkpoint taken after it is dropped.
+
+        Raises:
+            ValueError: If token is not a live checkpoint of this hollow.
+
+        Complexity:
+            Best Case Complexity: O(k + c) where k is the number of treasures taken since the checkpoint
+            and c the number of checkpoints taken after it, when the hollow can put a treasure back in O(1).
+            Worst Case Complexity: O(k log n + c) where n is the number of treasures in the hollow.
+        """
+        if self._undo_log is None or token not in self._checkpoints:
+            raise ValueError(f"Unknown or dropped checkpoint {token}")
+        # Tokens only grow, so the checkpoints taken after this one are the last ones in.
+        while next(reversed(self._checkpoints)) != token:
+            self._checkpoints.popitem()
+        while len(self._undo_log) > self._checkpoints[token]:
+            self._restore(self._undo_log.pop())
+
+    def release(self) -> None:
+        """
+        Drops every checkpoint, treasures taken from then on are no longer recorded.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._undo_log = None
+
+    def _record(self, entry: object) -> None:
+        """ Records an entry removed from the treasures structure while a checkpoint is live. """
+        if self._undo_log is not None:
+            self._undo_log.push(entry)
+
+    def _restore(self, entry: object) -> None:
+        """ Puts an entry recorded by _record back into the treasures structure. """
+        raise NotImplementedError(f"{type(self).__name__} can't put treasures back")
+
+
+class SpookyHollow(Checkpointed, Hollow):
 
     def restructure_hollow(self) -> None:
         """
@@ -72,18 +154,28 @@ class SpookyHollow(Hollow):
         Returns:
             None - This method should update the treasures attribute of the hollow
 
+        The treasures are kept in a CapacityTree keyed by their value / weight ratio, a balanced tree
+        whose nodes know the lightest treasure below them. The treasures can also be a TreasureBatch,
+        when its ranks column is filled in the tree is built in ratio order without sorting.
+
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+            Where n is the number of treasures in the hollow, sorting and building the balanced tree.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n log n)
             Worst Case Complexity: O(n log n)
             Where n is the number of treasures in the hollow
         """
-        raise NotImplementedError
+        self._undo_log = None
+        if isinstance(self.treasures, TreasureBatch) and self.treasures.ranks is not None:
+            batch: TreasureBatch = self.treasures
+            self.treasures = CapacityTree([(batch.ratio(index), batch[index]) for index in batch.by_ratio()], presorted=True)
+            return
+        self.treasures = CapacityTree([(treasure.value / treasure.weight, treasure) for treasure in self.treasures])
 
     def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
         """
@@ -104,15 +196,76 @@ class SpookyHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(1) when every treasure is too heavy.
+            Worst Case Complexity: O(log(n)) to find the ideal treasure from the lightest weight kept
+            in each node and to delete it from the balanced tree.
+            n is the number of treasures in the hollow
 
         Complexity requirements for full marks:
             Best Case Complexity: O(log(n))
             Worst Case Complexity: O(n)
             n is the number of treasures in the hollow 
         """
-        raise NotImplementedError
+        node: CapacityNode | None = self.treasures.best_fit(backpack_capacity)
+        if node is None:
+            return None
+        # Deleting a node with two children moves its successor into it, keep the treasure first.
+        treasure: Treasure = node.item
+        self._record((node.key, treasure))
+        del self.treasures[node.key]
+        return treasure
+
+    def _descending(self) -> Iterator[TreeNode]:
+        """
+        Walks the tree from the greatest ratio down, a reversed in order traversal.
+
+        Complexity:
+            Best Case Complexity: O(log(n)) to reach the greatest ratio.
+            Worst Case Complexity: O(n) to walk every node.
+            n is the number of treasures in the hollow
+        """
+        stack: LinkedStack[TreeNode] = LinkedStack()
+        current: TreeNode | None = self.treasures.root
+        while current is not None or not stack.is_empty():
+            while current is not None:
+                stack.push(current)
+                current = current.right
+            current = stack.pop()
+            yield current
+            current = current.left
+
+    def ranked_treasures(self) -> List[Treasure]:
+        """
+        Returns:
+            List[Treasure] - The treasures of the hollow from the greatest value / weight ratio to the
+            smallest, without taking any.
+
+        Complexity:
+            Best Case Complexity: O(n)
+            Worst Case Complexity: O(n)
+            n is the number of treasures in the hollow
+        """
+        return [node.item for node in self._descending()]
+
+    def lightest_weight(self) -> int | None:
+        """
+        Returns:
+            int | None - The weight of the lightest treasure in the hollow, None if it is empty.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.treasures.lightest_weight()
+
+    def _restore(self, entry: Tuple[float, Treasure]) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(log(n))
+            Worst Case Complexity: O(log(n))
+            n is the number of treasures in the hollow
+        """
+        self.treasures[entry[0]] = entry[1]
 
     def __str__(self) -> str:
         return Tiles.SPOOKY_HOLLOW.value
@@ -121,7 +274,66 @@ class SpookyHollow(Hollow):
         return str(self)
 
 
-class MysticalHollow(Hollow):
+class LazySpookyHollow(SpookyHollow):
+    """
+    A spooky hollow that generates and restructures its treasures on first access to `treasures`,
+    which `len`, `get_optimal_treasure` and every other method go through. Mazes with many hollows
+    then only pay for the hollows a path actually visits.
+
+    The treasures are generated from a seed of their own, so they don't depend on which
+    hollows are opened first or on how far the shared RandomGen stream has moved since,
+    and RandomGen is left as it was found. Filling itself on first access isn't a refill,
+    checkpoints taken before it stay live.
+    """
+
+    def __init__(self, seed: int) -> None:
+        """
+        Args:
+            seed(int): The RandomGen seed the treasures are generated from.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        # Hollow.__init__ would generate the treasures straight away.
+        self._seed: int | None = seed
+
+    @property
+    def treasures(self):
+        """
+        Complexity:
+            Best Case Complexity: O(1) once the hollow is materialised.
+            Worst Case Complexity: O(gen_treasures + restructure_hollow) on first access.
+        """
+        if self._seed is not None:
+            self._materialise()
+        return self._treasures
+
+    @treasures.setter
+    def treasures(self, treasures) -> None:
+        # Filling the hollow by hand replaces the treasures it would have generated.
+        self._seed = None
+        self._treasures = treasures
+
+    @property
+    def materialised(self) -> bool:
+        return self._seed is None
+
+    def _materialise(self) -> None:
+        seed: int = self._seed
+        saved: int = RandomGen.seed
+        RandomGen.set_seed(seed)
+        try:
+            self.treasures = self.gen_treasures()
+        finally:
+            RandomGen.set_seed(saved)
+        # Nothing can be taken before the treasures exist, so checkpoints taken so far stay valid.
+        undo_log: LinkedStack | None = self._undo_log
+        self.restructure_hollow()
+        self._undo_log = undo_log
+
+
+class MysticalHollow(Checkpointed, Hollow):
 
     def restructure_hollow(self):
         """
@@ -137,15 +349,21 @@ class MysticalHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n)
+            Worst Case Complexity: O(n)
+            Where n is the number of treasures in the hollow, bucketing each treasure by weight
+            and heapifying every bucket, there are O(log W) buckets for a greatest weight W.
+            The treasures can also be a TreasureBatch, its views are bucketed the same way.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n)
             Worst Case Complexity: O(n)
             Where n is the number of treasures in the hollow
         """
-        raise NotImplementedError
+        self._undo_log = None
+        # The position breaks ties between equal ratios so treasures themselves are never compared.
+        self.treasures = HeapForest([(treasure.value / treasure.weight, -position, treasure)
+                                     for position, treasure in enumerate(self.treasures)])
 
     def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
         """
@@ -166,18 +384,127 @@ class MysticalHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(log n) when the best treasure is the top of a bucket lighter than the capacity.
+            Worst Case Complexity: O(k log k) where k is the number of treasures in the weight bucket the
+            capacity falls in, when they are popped and pushed back, at most O(n log n).
+            Where n is the number of treasures in the hollow, see `HeapForest.take_best`.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(log n)
             Worst Case Complexity: O(n log n)
             Where n is the number of treasures in the hollow
         """
-        raise NotImplementedError
+        entry: Entry | None = self.treasures.take_best(backpack_capacity)
+        if entry is None:
+            return None
+        self._record(entry)
+        return entry[2]
+
+    def ranked_treasures(self) -> List[Treasure]:
+        """
+        Returns:
+            List[Treasure] - The treasures of the hollow from the greatest value / weight ratio to the
+            smallest, without taking any.
+
+        Complexity:
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+            Where n is the number of treasures in the hollow, popping every treasure off a heap of them all.
+        """
+        heap: MaxHeap = MaxHeap.heapify([entry for entry in self.treasures])
+        return [heap.get_max()[2] for _ in range(len(heap))]
+
+    def lightest_weight(self) -> int | None:
+        """
+        Returns:
+            int | None - The weight of the lightest treasure in the hollow, None if it is empty.
+
+        Complexity:
+            Best Case Complexity: O(log W) when the lightest weight bucket holds one treasure.
+            Worst Case Complexity: O(n)
+            Where n is the number of treasures in the hollow and W the greatest weight.
+        """
+        return self.treasures.lightest_weight()
+
+    def _restore(self, entry: Entry) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1) when the treasure doesn't rise.
+            Worst Case Complexity: O(log n) where n is the number of treasures in the hollow.
+        """
+        self.treasures.add(entry)
 
     def __str__(self) -> str:
         return Tiles.MYSTICAL_HOLLOW.value
 
     def __repr__(self) -> str:
         return str(self)
+
+
+class ConcurrentMysticalHollow(MysticalHollow):
+    """
+    A mystical hollow that several explorer threads can take from at once.
+
+    Every mystical tile of a maze shares one mystical hollow, so two threads taking from
+    different tiles still race on the same heap. Each operation on the heap runs under a
+    lock owned by the hollow, which serialises takers of the shared pool only: spooky
+    hollows and the rest of the maze are never locked. As a take pops and pushes back
+    under the lock, each treasure is handed out exactly once.
+
+    Opt in with `Maze.load_maze_from_file(maze_name, thread_safe=True)`.
+    """
+
+    def __init__(self) -> None:
+        # The lock must exist before Hollow.__init__ restructures the hollow.
+        self._lock: threading.Lock = threading.Lock()
+        super().__init__()
+
+    def restructure_hollow(self) -> None:
+        with self._lock:
+            super().restructure_hollow()
+
+    def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
+        """
+        See `MysticalHollow.get_optimal_treasure`, atomic with respect to every other operation on the hollow.
+
+        Complexity:
+            Best Case Complexity: O(log n) when the treasure with the greatest ratio fits and the lock is free.
+            Worst Case Complexity: O(n log n) plus the time spent waiting for the lock.
+            Where n is the number of treasures in the hollow
+        """
+        with self._lock:
+            return super().get_optimal_treasure(backpack_capacity)
+
+    def ranked_treasures(self) -> List[Treasure]:
+        with self._lock:
+            return super().ranked_treasures()
+
+    def lightest_weight(self) -> int | None:
+        with self._lock:
+            return super().lightest_weight()
+
+    def checkpoint(self) -> int:
+        with self._lock:
+            return super().checkpoint()
+
+    def rollback(self, token: int) -> None:
+        with self._lock:
+            super().rollback(token)
+
+    def release(self) -> None:
+        with self._lock:
+            super().release()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return super().__len__()
+
+    def __getstate__(self) -> dict:
+        # Locks can't be copied or pickled, clones get a lock of their own.
+        state: dict = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+import os
+from array import array
+from collections import deque
+from copy import deepcopy
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Deque, Iterable, Iterator, List, Tuple
 
+from algorithms.dead_end_filling import DeadEndFill, fill_dead_ends
+from algorithms.hierarchical_search import ClusterGraph
+from algorithms.incremental_search import IncrementalPlanner
+from algorithms.junction_graph import JunctionGraph
+from algorithms.maze_search import DEAD_END_ENGINES, ENGINES, SearchEngine
+from algorithms.treasure_route import RankedHollows, RouteDistances, plan_route
 from config import Directions, Tiles
-from hollows import Hollow, MysticalHollow, SpookyHollow
+from hollows import ConcurrentMysticalHollow, Hollow, LazySpookyHollow, MysticalHollow, SpookyHollow
+from maze_binary import BinaryMazeFile, write_binary_maze
+from random_gen import RandomGen
 from treasure import Treasure
 
 
 class Position:
+    """
+    Positions are values, they are hashable so should not be changed once created.
+    A position can also be packed into the single integer row * cols + col for a maze with
+    cols columns, see `pack` and `unpack`.
+    """
+    __slots__ = ('row', 'col')
+
     def __init__(self, row: int, col: int) -> None:
         """
         Args:
@@ -21,6 +40,38 @@ class Position:
     def __eq__(self, value: object) -> bool:
         return isinstance(value, Position) and value.row == self.row and value.col == self.col
 
+    def __hash__(self) -> int:
+        return hash((self.row, self.col))
+
+    def pack(self, cols: int) -> int:
+        """
+        Args:
+            cols(int): Number of columns in the maze.
+
+        Returns:
+            int - The row major cell index of this position, row * cols + col.
+
+        Complexity:
+            O(1)
+        """
+        return self.row * cols + self.col
+
+    @staticmethod
+    def unpack(index: int, cols: int) -> Position:
+        """
+        Args:
+            index(int): A row major cell index as returned by `pack`.
+            cols(int): Number of columns in the maze.
+
+        Returns:
+            Position - The position of the cell index.
+
+        Complexity:
+            O(1)
+        """
+        row, col = divmod(index, cols)
+        return Position(row, col)
+
     def __repr__(self):
         return str(self)
 
@@ -28,6 +79,37 @@ class Position:
         return f"({self.row}, {self.col})"
 
 
+@dataclass
+class MazeLayout:
+    """
+    The tiles of a maze file as read by `Maze._scan_maze_file`, before any hollows are generated.
+    tiles holds the character code of every tile in row major order, with empty cells stored as ' ',
+    and hollows holds the tile character (S or M) of every hollow alongside its position.
+    """
+    rows: int
+    cols: int
+    start_position: Position | None
+    end_positions: List[Position]
+    hollows: List[tuple[str, Position]]
+    tiles: bytearray
+
+
+@dataclass
+class TreasureRoute:
+    """
+    A route through the maze chosen by `Maze.plan_treasure_route`.
+
+    path: The positions of the route from the start position to an exit.
+    treasures: The treasures `Maze.take_treasures` takes along path, in the order they are taken.
+    """
+    path: List[Position]
+    treasures: List[Treasure]
+
+    @property
+    def value(self) -> int:
+        return sum(treasure.value for treasure in self.treasures)
+
+
 @dataclass
 class MazeCell:
     tile: str | Hollow
@@ -41,6 +123,195 @@ class MazeCell:
         return f"'{self.tile}'"
 
 
+class MazeCellView(MazeCell):
+    """
+    A MazeCell backed by the tile plane, hollow table and visited bitmap of a compact maze.
+    Views hold no state of their own, they are created on demand by `CompactGrid` and
+    every read or write goes straight through to the maze.
+    """
+    __slots__ = ('_maze', '_index')
+
+    def __init__(self, maze: Maze, index: int) -> None:
+        """
+        Args:
+            maze(Maze): The compact maze this cell belongs to.
+            index(int): The row major index of the cell, row * cols + col.
+        """
+        self._maze: Maze = maze
+        self._index: int = index
+
+    @property
+    def tile(self) -> str | Hollow:
+        code: int = self._maze._tiles[self._index]
+        if code in Maze.hollow_codes:
+            return self._maze._hollows[self._index]
+        return chr(code)
+
+    @tile.setter
+    def tile(self, tile: str | Hollow) -> None:
+        if isinstance(tile, Hollow):
+            self._maze._hollows[self._index] = tile
+        else:
+            self._maze._hollows.pop(self._index, None)
+        self._maze._tiles[self._index] = ord(str(tile))
+
+    @property
+    def position(self) -> Position:
+        return self._maze.position_at(self._index)
+
+    @property
+    def visited(self) -> bool:
+        return bool(self._maze._visited[self._index >> 3] & (1 << (self._index & 7)))
+
+    @visited.setter
+    def visited(self, visited: bool) -> None:
+        if visited:
+            self._maze._visited[self._index >> 3] |= 1 << (self._index & 7)
+        else:
+            self._maze._visited[self._index >> 3] &= ~(1 << (self._index & 7))
+
+
+class CompactRow:
+    """
+    A single row of a `CompactGrid`, behaves like the List[MazeCell] rows of a regular grid.
+    """
+
+    def __init__(self, maze: Maze, row: int) -> None:
+        self._maze: Maze = maze
+        self._offset: int = row * maze.cols
+
+    def __len__(self) -> int:
+        return self._maze.cols
+
+    def __getitem__(self, col: int) -> MazeCellView:
+        if col < 0:
+            col += self._maze.cols
+        if not 0 <= col < self._maze.cols:
+            raise IndexError("Column index out of range")
+        return MazeCellView(self._maze, self._offset + col)
+
+    def __iter__(self) -> Iterator[MazeCellView]:
+        for index in range(self._offset, self._offset + self._maze.cols):
+            yield MazeCellView(self._maze, index)
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class CompactGrid:
+    """
+    Exposes the tile plane of a compact maze as `grid[row][col]`, creating
+    lightweight `MazeCellView` objects on demand rather than storing one MazeCell per cell.
+    """
+
+    def __init__(self, maze: Maze) -> None:
+        self._maze: Maze = maze
+
+    def __len__(self) -> int:
+        return self._maze.rows
+
+    def __getitem__(self, row: int) -> CompactRow:
+        if row < 0:
+            row += self._maze.rows
+        if not 0 <= row < self._maze.rows:
+            raise IndexError("Row index out of range")
+        return CompactRow(self._maze, row)
+
+    def __iter__(self) -> Iterator[CompactRow]:
+        for row in range(self._maze.rows):
+            yield CompactRow(self._maze, row)
+
+
+class MazeLoadCache:
+    """
+    Bounded LRU cache of parsed mazes used by `Maze.load_maze_from_file` when set as `Maze.load_cache`.
+
+    Entries are keyed by the maze file, grid representation and kinds of hollow and remember the
+    modification time and size of the file, a cached maze is only reused while both are
+    unchanged. Every hit returns an independent clone of the cached maze, so callers always
+    get unvisited cells and hollows they are free to empty.
+
+    Usage:
+    ```
+    Maze.load_cache = MazeLoadCache(max_size=8)
+    maze = Maze.load_maze_from_file("sample.txt")  # miss, parsed from the file
+    maze = Maze.load_maze_from_file("sample.txt")  # hit, cloned from the cache
+    ```
+    """
+
+    def __init__(self, max_size: int = 16) -> None:
+        """
+        Args:
+            max_size(int): The number of mazes kept before the least recently used is evicted.
+        """
+        if max_size < 1:
+            raise ValueError("The cache must be able to hold at least one maze")
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        # Python dictionaries keep insertion order, the first key is the least recently used.
+        self._entries: dict[tuple[str, bool, bool, bool], tuple[tuple[int, int], Maze]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(maze_name: str, compact: bool, thread_safe: bool,
+             lazy: bool) -> tuple[tuple[str, bool, bool, bool], tuple[int, int]]:
+        path: str = os.path.realpath(f"./mazes/{maze_name}")
+        stat: os.stat_result = os.stat(path)
+        return (path, compact, thread_safe, lazy), (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, maze_name: str, compact: bool = False, thread_safe: bool = False, lazy: bool = False) -> Maze | None:
+        """
+        Args:
+            maze_name(str): The maze name the maze was loaded from.
+            compact(bool): Whether the maze uses the compact grid representation.
+            thread_safe(bool): Whether the maze shares a ConcurrentMysticalHollow.
+            lazy(bool): Whether the spooky hollows of the maze are LazySpookyHollows.
+
+        Return:
+            Maze: A clone of the cached maze.
+            None: If the maze is not cached or its file has changed.
+
+        Complexity:
+            Best Case Complexity: O(1) on a miss.
+            Worst Case Complexity: O(clone) on a hit.
+        """
+        key, signature = self._key(maze_name, compact, thread_safe, lazy)
+        entry: tuple[tuple[int, int], Maze] | None = self._entries.pop(key, None)
+        if entry is None or entry[0] != signature:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries[key] = entry
+        return entry[1].clone()
+
+    def put(self, maze_name: str, compact: bool, maze: Maze, thread_safe: bool = False, lazy: bool = False) -> None:
+        """
+        Caches maze, evicting the least recently used maze if the cache is full.
+        The cache takes ownership of maze, callers should pass a maze nobody else uses.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        key, signature = self._key(maze_name, compact, thread_safe, lazy)
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (signature, maze)
+
+    def clear(self) -> None:
+        """ Empties the cache and resets the hit and miss counters. """
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+
 class Maze:
     directions: dict[Directions, Tuple[int, int]] = {
         Directions.UP: (-1, 0),
@@ -48,12 +319,21 @@ class Maze:
         Directions.LEFT: (0, -1),
         Directions.RIGHT: (0, 1),
     }
+    # Opt-in cache used by load_maze_from_file, None disables caching.
+    load_cache: MazeLoadCache | None = None
+    # Tile plane codes of the hollow tiles, the hollows themselves live in a side table.
+    hollow_codes: frozenset[int] = frozenset({ord(Tiles.SPOOKY_HOLLOW.value), ord(Tiles.MYSTICAL_HOLLOW.value)})
+    wall_code: int = ord(Tiles.WALL.value)
 
-    def __init__(self, start_position: Position, end_positions: List[Position], walls: List[Position], hollows: List[tuple[Hollow, Position]], rows: int, cols: int) -> None:
+    def __init__(self, start_position: Position, end_positions: List[Position], walls: List[Position], hollows: List[tuple[Hollow, Position]], rows: int, cols: int, compact: bool = False) -> None:
         """
         Constructs the maze you should never be interacting with this method.
         Please take a look at `load_maze_from_file` & `sample1`
 
+        A compact maze stores its tiles in a flat bytearray with the hollows in a side table
+        keyed by cell index and the visited flags in a separate bitmap. Its grid is a
+        `CompactGrid` which still supports `maze.grid[row][col]`.
+
         Args:
             start_position(Position): Starting position in the maze.
             end_positions(List[Position]): End positions in the maze.
@@ -61,16 +341,139 @@ class Maze:
             hollows(List[Position]): Hollows in the maze.
             rows(int): Number of rows in the maze.
             cols(int): Number of columns in the maze.
+            compact(bool): Whether to use the compact grid representation.
 
         Complexity:
             Best Case Complexity: O(_create_grid)
             Worst Case Complexity: O(_create_grid)
         """
+        self._setup(start_position, end_positions, rows, cols, compact)
+        if compact:
+            self._set_tile_plane(*self._create_tiles(walls, hollows, end_positions))
+        else:
+            self.grid: List[List[MazeCell]] | CompactGrid = self._create_grid(walls, hollows, end_positions)
+
+    @classmethod
+    def _from_tiles(cls, tiles: bytearray | memoryview, hollows: dict[int, Hollow], start_position: Position, end_positions: List[Position], rows: int, cols: int) -> Maze:
+        """
+        Constructs a compact maze directly from a tile plane without
+        materialising a Position for every wall.
+
+        Args:
+            tiles(bytearray | memoryview): One tile code per cell in row major order.
+            hollows(dict[int, Hollow]): Hollows keyed by their cell index.
+            start_position(Position): Starting position in the maze.
+            end_positions(List[Position]): End positions in the maze.
+            rows(int): Number of rows in the maze.
+            cols(int): Number of columns in the maze.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        maze: Maze = cls.__new__(cls)
+        maze._setup(start_position, end_positions, rows, cols, True)
+        maze._set_tile_plane(tiles, hollows)
+        return maze
+
+    def _setup(self, start_position: Position, end_positions: List[Position], rows: int, cols: int, compact: bool) -> None:
+        """
+        Sets the attributes shared by every way of constructing a maze, everything but the grid.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
         self.start_position: Position = start_position
         self.end_positions: List[Position] = end_positions
         self.rows: int = rows
         self.cols: int = cols
-        self.grid: List[List[MazeCell]] = self._create_grid(walls, hollows, end_positions)
+        self.compact: bool = compact
+        self._exits: set[int] = {position.pack(cols) for position in end_positions}
+        # Flyweight table of the positions handed out by position_at, filled in as they are requested.
+        self._positions: dict[int, Position] = {}
+        # (direction bit, cell index offset) pairs in the same order as Maze.directions.
+        self.neighbour_offsets: tuple[tuple[int, int], ...] = tuple(
+            (1 << bit, row * cols + col) for bit, (row, col) in enumerate(self.directions.values()))
+        self._masks: bytearray | None = None
+        self._distances: array | None = None
+        self._track_components: bool = False
+        self._components: array | None = None
+        self._exit_components: set[int] = set()
+        self._clusters: ClusterGraph | None = None
+        self._planner: IncrementalPlanner | None = None
+        self._junctions: JunctionGraph | None = None
+        self._dead_ends: DeadEndFill | None = None
+        self._route_distances: RouteDistances | None = None
+
+    def clone(self) -> Maze:
+        """
+        Creates an independent copy of this maze with every cell unvisited.
+        Hollows are deep copied, hollows shared between cells (the mystical hollow)
+        stay shared between the same cells of the clone.
+
+        Return:
+            Maze: The cloned maze.
+
+        Complexity:
+            Best Case Complexity: O(N + T) where N is the number of cells in the maze
+            and T is the number of treasures in its hollows.
+            Worst Case Complexity: O(N + T) where N is the number of cells in the maze
+            and T is the number of treasures in its hollows.
+        """
+        memo: dict = {}
+        if self.compact:
+            hollows: dict[int, Hollow] = {index: deepcopy(hollow, memo) for index, hollow in self._hollows.items()}
+            maze: Maze = self._from_tiles(bytearray(self._tiles), hollows, self.start_position,
+                                          list(self.end_positions), self.rows, self.cols)
+        else:
+            maze = self.__class__.__new__(self.__class__)
+            maze._setup(self.start_position, list(self.end_positions), self.rows, self.cols, False)
+            maze.grid = [[MazeCell(deepcopy(cell.tile, memo) if isinstance(cell.tile, Hollow) else cell.tile, cell.position)
+                          for cell in row] for row in self.grid]
+        if self._masks is not None:
+            maze._masks = bytearray(self._masks)
+        maze._track_components = self._track_components
+        return maze
+
+    def _set_tile_plane(self, tiles: bytearray | memoryview, hollows: dict[int, Hollow]) -> None:
+        """
+        Switches this maze to the compact representation backed by tiles.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        self._tiles: bytearray | memoryview = tiles
+        self._hollows: dict[int, Hollow] = hollows
+        self._visited: bytearray = bytearray((self.rows * self.cols + 7) >> 3)
+        self.grid = CompactGrid(self)
+
+    def _create_tiles(self, walls: List[Position], hollows: List[tuple[Hollow, Position]], end_positions: List[Position]) -> tuple[bytearray, dict[int, Hollow]]:
+        """
+        Args:
+            walls(List[Position]): Walls in the maze.
+            hollows(List[Position]): Hollows in the maze.
+            end_positions(List[Position]): End positions in the maze.
+
+        Return:
+            tuple[bytearray, dict[int, Hollow]]: The tile plane and hollow table of the maze.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        tiles: bytearray = bytearray(b' ') * (self.rows * self.cols)
+        hollow_table: dict[int, Hollow] = {}
+        tiles[self.start_position.pack(self.cols)] = ord(Tiles.START_POSITION.value)
+        for wall in walls:
+            tiles[wall.pack(self.cols)] = ord(Tiles.WALL.value)
+        for hollow, pos in hollows:
+            tiles[pos.pack(self.cols)] = ord(str(hollow))
+            hollow_table[pos.pack(self.cols)] = hollow
+        for end_position in end_positions:
+            tiles[end_position.pack(self.cols)] = ord(Tiles.EXIT.value)
+        return tiles, hollow_table
 
     def _create_grid(self, walls: List[Position], hollows: List[(Hollow, Position)], end_positions: List[Position]) -> List[List[MazeCell]]:
         """
@@ -115,76 +518,654 @@ class Maze:
             ValueError: If maze_name is invalid.
 
         Complexity:
-            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Best Case Complexity: O(1) when the first row is invalid.
             Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        Maze._scan_maze_file(maze_name)
 
-            Assuming dictionary operations can be done on O(1) time.
+    @staticmethod
+    def _scan_maze_file(maze_name: str) -> MazeLayout:
+        """
+        Streams the maze file a single line at a time, validating each tile as it is read
+        and recording the layout needed to build the grid. The file is only read once and
+        never held in memory as a whole.
+
+        Args:
+            maze_name(str): The name of the maze.
+
+        Return:
+            MazeLayout: The positions of every non empty tile in the maze.
+
+        Raises:
+            ValueError: If maze_name is invalid, reporting the row and column of the
+            first offending tile where there is one.
+
+        Complexity:
+            Best Case Complexity: O(1) when the first row is invalid.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
         """
-        tile_count: dict[str, int] = {}
+        valid_types: set[str] = {tile.value for tile in Tiles}
+        layout: MazeLayout = MazeLayout(0, 0, None, [], [], bytearray())
         with open(f"./mazes/{maze_name}", 'r') as f:
-            lines: List[str] = f.readlines()
-            cols: int = len(lines[0].strip())
-            for line in lines:
-                if len(line.strip()) != cols:
-                    raise ValueError(f"Uneven columns in {maze_name} ensure all rows have the same number of columns")
-                # Check tiles
-                for tile in line.strip():
-                    if tile not in tile_count:
-                        tile_count[tile] = 1
-                    else:
-                        tile_count[tile] += 1
-        if 'P' not in tile_count or 'E' not in tile_count:
-            raise ValueError(f"Missing start or end position in {maze_name}")
+            for i, line in enumerate(f):
+                row: str = line.strip()
+                if i == 0:
+                    layout.cols = len(row)
+                elif len(row) != layout.cols:
+                    raise ValueError(f"Uneven columns in {maze_name} ensure all rows have the same number of columns "
+                                     f"(row {i}, column {min(len(row), layout.cols)})")
+                for j, tile in enumerate(row):
+                    if tile == Tiles.WALL.value or tile == Tiles.EMPTY.value:
+                        continue
+                    elif tile == Tiles.START_POSITION.value:
+                        if layout.start_position is not None:
+                            raise ValueError(f"Multiple start positions found in {maze_name} (row {i}, column {j})")
+                        layout.start_position = Position(i, j)
+                    elif tile == Tiles.EXIT.value:
+                        layout.end_positions.append(Position(i, j))
+                    elif tile == Tiles.SPOOKY_HOLLOW.value or tile == Tiles.MYSTICAL_HOLLOW.value:
+                        layout.hollows.append((tile, Position(i, j)))
+                    elif tile not in valid_types:
+                        raise ValueError(f"Invalid tile(s) found in {maze_name} ({[tile]}) (row {i}, column {j})")
+                layout.tiles += row.replace(Tiles.EMPTY.value, ' ').encode()
+                layout.rows += 1
 
-        if tile_count['P'] > 1:
-            raise ValueError(f"Multiple start positions found in {maze_name}")
+        if layout.start_position is None or not layout.end_positions:
+            raise ValueError(f"Missing start or end position in {maze_name}")
 
         # Check we have at least one treasure
-        if not (Tiles.SPOOKY_HOLLOW.value in tile_count or Tiles.MYSTICAL_HOLLOW.value in tile_count):
+        if not layout.hollows:
             raise ValueError(f"No treasures found in {maze_name}")
-
-        valid_types: List[str] = [tile.value for tile in Tiles]
-        invalid_tiles: List[str] = [tile for tile in tile_count if tile not in valid_types]
-        if invalid_tiles:
-            raise ValueError(f"Invalid tile(s) found in {maze_name} ({invalid_tiles})")
+        return layout
 
     @classmethod
-    def load_maze_from_file(cls, maze_name: str) -> Maze:
+    def load_maze_from_file(cls, maze_name: str, compact: bool = False, label_components: bool = False,
+                            thread_safe: bool = False, lazy: bool = False) -> Maze:
         """
+        Validates and parses the maze in a single streaming pass over the file.
+
+        When `Maze.load_cache` is set, mazes which have already been loaded and whose file
+        has not changed since are returned as clones of the cached maze instead, see `MazeLoadCache`.
+
         Args:
             maze_name(str): The maze name to load the maze from.
+            compact(bool): Whether to use the compact grid representation, see `Maze.__init__`.
+            label_components(bool): Whether to label the connected regions of the maze, see `label_components`.
+            thread_safe(bool): Whether the mystical tiles share a `ConcurrentMysticalHollow`, so that
+            several threads can take treasures from the maze at once.
+            lazy(bool): Whether the spooky hollows are `LazySpookyHollow`s, generating their treasures on
+            first access from a seed drawn for each of them here, in the order they appear in the file.
 
         Return:
             Maze: The newly created maze instance.
 
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
         Complexity:
             Best Case Complexity: O(N) where N is the number of cells in the maze.
             Worst Case Complexity: O(N) where N is the number of cells in the maze.
 
             For small mazes we assume the lists we not need to resize.
         """
-        cls.validate_maze_file(maze_name)
-        end_positions, walls, hollows = [], [], []
+        cache: MazeLoadCache | None = cls.load_cache
+        maze: Maze | None = None if cache is None else cache.get(maze_name, compact, thread_safe, lazy)
+        if maze is None:
+            maze = cls._parse_maze_file(maze_name, compact, thread_safe, lazy)
+            if cache is not None:
+                cache.put(maze_name, compact, maze.clone(), thread_safe, lazy)
+        if label_components:
+            maze.label_components()
+        return maze
+
+    @classmethod
+    def _parse_maze_file(cls, maze_name: str, compact: bool, thread_safe: bool = False, lazy: bool = False) -> Maze:
+        """
+        Args:
+            maze_name(str): The maze name to load the maze from.
+            compact(bool): Whether to use the compact grid representation.
+            thread_safe(bool): Whether to share a ConcurrentMysticalHollow instead of a MysticalHollow.
+            lazy(bool): Whether to use LazySpookyHollows instead of SpookyHollows.
+
+        Return:
+            Maze: The newly created maze instance.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        layout: MazeLayout = cls._scan_maze_file(maze_name)
+        # The mystical hollow is generated before any spooky hollow to keep the treasures
+        # drawn for a given random seed the same as they have always been. It is shared by
+        # every mystical tile so it is never lazy, its first access could come from any thread.
+        mystical_hollow: MysticalHollow = ConcurrentMysticalHollow() if thread_safe else MysticalHollow()
+        hollows: List[tuple[Hollow, Position]] = []
+        for tile, position in layout.hollows:
+            if tile == Tiles.MYSTICAL_HOLLOW.value:
+                hollows.append((mystical_hollow, position))
+            else:
+                hollows.append((LazySpookyHollow(RandomGen.random()) if lazy else SpookyHollow(), position))
+        if compact:
+            hollow_table: dict[int, Hollow] = {pos.pack(layout.cols): hollow for hollow, pos in hollows}
+            return cls._from_tiles(layout.tiles, hollow_table, layout.start_position, layout.end_positions, layout.rows, layout.cols)
+
+        walls: List[Position] = [Position.unpack(index, layout.cols)
+                                 for index, code in enumerate(layout.tiles) if code == cls.wall_code]
+        return Maze(layout.start_position, layout.end_positions, walls, hollows, layout.rows, layout.cols)
+
+    @classmethod
+    def load_maze_from_binary(cls, maze_name: str, validate: bool = False) -> Maze:
+        """
+        Opens a maze saved in the binary format (see maze_binary.py) as a compact maze.
+        The tile plane is memory mapped and used in place, only the header, exits and
+        hollows are decoded.
+
+        Args:
+            maze_name(str): The binary maze to load the maze from.
+            validate(bool): Whether to also scan the tile plane for unknown tile codes.
+
+        Return:
+            Maze: The newly created compact maze instance.
+
+        Raises:
+            ValueError: If maze_name is not a valid binary maze, see `BinaryMazeFile`.
+
+        Complexity:
+            Best Case Complexity: O(E + H) where E is the number of exits and H the number of hollows.
+            Worst Case Complexity: O(E + H) where E is the number of exits and H the number of hollows,
+            O(N + E + H) where N is the number of cells in the maze when validating.
+        """
+        maze_file: BinaryMazeFile = BinaryMazeFile(f"./mazes/{maze_name}", validate)
+        cols: int = maze_file.cols
         mystical_hollow: MysticalHollow = MysticalHollow()
-        start_position: Position | None = None
-        with open(f"./mazes/{maze_name}", 'r') as f:
-            lines: List[str] = f.readlines()
-            rows: int = len(lines)
-            cols: int = len(lines[0].strip())
-            for i, line in enumerate(lines):
-                for j, tile in enumerate(line.strip()):
-                    if tile == Tiles.START_POSITION.value:
-                        start_position: Position = Position(i, j)
-                    elif tile == Tiles.EXIT.value:
-                        end_positions.append(Position(i, j))
-                    elif tile == Tiles.WALL.value:
-                        walls.append(Position(i, j))
-                    elif tile == Tiles.SPOOKY_HOLLOW.value:
-                        hollows.append((SpookyHollow(), Position(i, j)))
-                    elif tile == Tiles.MYSTICAL_HOLLOW.value:
-                        hollows.append((mystical_hollow, Position(i, j)))
-        assert start_position is not None
-        return Maze(start_position, end_positions, walls, hollows, rows, cols)
+        mystical_code: int = ord(Tiles.MYSTICAL_HOLLOW.value)
+        hollows: dict[int, Hollow] = {}
+        for index in maze_file.hollows:
+            hollows[index] = mystical_hollow if maze_file.tiles[index] == mystical_code else SpookyHollow()
+        end_positions: List[Position] = [Position.unpack(index, cols) for index in maze_file.exits]
+        return cls._from_tiles(maze_file.tiles, hollows, Position.unpack(maze_file.start, cols),
+                               end_positions, maze_file.rows, cols)
+
+    @staticmethod
+    def convert_to_binary(maze_name: str, binary_name: str) -> None:
+        """
+        Converts a text maze into the binary format, validating it along the way.
+
+        Args:
+            maze_name(str): The text maze to convert.
+            binary_name(str): The name of the binary maze to write.
+
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        layout: MazeLayout = Maze._scan_maze_file(maze_name)
+        cols: int = layout.cols
+        write_binary_maze(f"./mazes/{binary_name}", layout.rows, cols,
+                          layout.start_position.pack(cols),
+                          [pos.pack(cols) for pos in layout.end_positions],
+                          [pos.pack(cols) for _, pos in layout.hollows],
+                          layout.tiles)
+
+    @staticmethod
+    def convert_to_text(binary_name: str, maze_name: str) -> None:
+        """
+        Converts a binary maze back into the text format.
+
+        Args:
+            binary_name(str): The binary maze to convert.
+            maze_name(str): The name of the text maze to write.
+
+        Raises:
+            ValueError: If binary_name is not a valid binary maze.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        maze_file: BinaryMazeFile = BinaryMazeFile(f"./mazes/{binary_name}")
+        cols: int = maze_file.cols
+        with open(f"./mazes/{maze_name}", 'w') as f:
+            for row in range(maze_file.rows):
+                line: str = bytes(maze_file.tiles[row * cols:(row + 1) * cols]).decode()
+                f.write(line.replace(' ', Tiles.EMPTY.value) + "\n")
+
+    def position_at(self, index: int) -> Position:
+        """
+        Returns the shared Position of a cell index, every call for the same cell returns the
+        same object so paths and visited sets built from indices don't allocate new positions.
+
+        Args:
+            index(int): A row major cell index, see `Position.pack`.
+
+        Returns:
+            Position - The interned position of index.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+
+            Assuming dictionary operations can be done on O(1) time.
+        """
+        position: Position | None = self._positions.get(index)
+        if position is None:
+            position = Position.unpack(index, self.cols)
+            self._positions[index] = position
+        return position
+
+    def is_exit(self, position: Position | int) -> bool:
+        """
+        Args:
+            position(Position | int): A position or its packed cell index.
+
+        Returns:
+            bool - True if the position is one of the end positions of the maze.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+
+            Assuming set operations can be done on O(1) time.
+        """
+        if isinstance(position, Position):
+            position = position.pack(self.cols)
+        return position in self._exits
+
+    def _is_wall(self, index: int) -> bool:
+        """
+        Args:
+            index(int): A row major cell index inside the maze.
+
+        Returns:
+            bool - True if the cell is a wall.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self.compact:
+            return self._tiles[index] == Maze.wall_code
+        row, col = divmod(index, self.cols)
+        return self.grid[row][col].tile == Tiles.WALL.value
+
+    def _is_hollow(self, index: int) -> bool:
+        """
+        Args:
+            index(int): A row major cell index inside the maze.
+
+        Returns:
+            bool - True if the cell holds a hollow.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self.compact:
+            return index in self._hollows
+        row, col = divmod(index, self.cols)
+        return isinstance(self.grid[row][col].tile, Hollow)
+
+    def hollow_at(self, index: int) -> Hollow | None:
+        """
+        Args:
+            index(int): A row major cell index inside the maze.
+
+        Returns:
+            Hollow | None - The hollow in the cell, None if the cell holds no hollow.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self.compact:
+            return self._hollows.get(index)
+        tile: str | Hollow = self.grid[index // self.cols][index % self.cols].tile
+        return tile if isinstance(tile, Hollow) else None
+
+    def _cell_mask(self, index: int) -> int:
+        """
+        Works out the passability mask of a single cell, bit i is set when the neighbour in the
+        i-th direction of Maze.directions is inside the maze and not a wall. Walls have no moves.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self._is_wall(index):
+            return 0
+        row, col = divmod(index, self.cols)
+        mask: int = 0
+        for bit, (row_step, col_step) in enumerate(self.directions.values()):
+            next_row, next_col = row + row_step, col + col_step
+            if 0 <= next_row < self.rows and 0 <= next_col < self.cols \
+                    and not self._is_wall(next_row * self.cols + next_col):
+                mask |= 1 << bit
+        return mask
+
+    @property
+    def neighbour_masks(self) -> bytearray:
+        """
+        The passability mask of every cell as one byte per cell in row major order, see `_cell_mask`.
+        The masks are built once, the first time they are needed, so loading a binary maze stays
+        O(header), and are kept up to date by `_set_tile`.
+
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to build the masks.
+        """
+        if self._masks is None:
+            cells: int = self.rows * self.cols
+            if self.compact:
+                walls: List[bool] = [code == Maze.wall_code for code in self._tiles]
+            else:
+                walls = [cell.tile == Tiles.WALL.value for row in self.grid for cell in row]
+            masks: bytearray = bytearray(cells)
+            last_row: int = cells - self.cols
+            for index in range(cells):
+                if walls[index]:
+                    continue
+                col: int = index % self.cols
+                masks[index] = ((index >= self.cols and not walls[index - self.cols])
+                                | (index < last_row and not walls[index + self.cols]) << 1
+                                | (col > 0 and not walls[index - 1]) << 2
+                                | (col < self.cols - 1 and not walls[index + 1]) << 3)
+            self._masks = masks
+        return self._masks
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        """
+        Iterates over the cell indices that can be moved to from index, in the
+        order of Maze.directions.
+
+        Args:
+            index(int): A row major cell index, see `Position.pack`.
+
+        Returns:
+            Iterator[int] - The packed cell indices of the passable neighbours.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        mask: int = self.neighbour_masks[index]
+        for bit, offset in self.neighbour_offsets:
+            if mask & bit:
+                yield index + offset
+
+    def _invalidate_caches(self) -> None:
+        """
+        Drops everything derived from the layout of the maze, it is rebuilt the next time it is needed.
+        The neighbour masks are not dropped as `_set_tile` updates them in place.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._distances = None
+        self._components = None
+        self._junctions = None
+        self._dead_ends = None
+        self._route_distances = None
+
+    @property
+    def exit_distances(self) -> array:
+        """
+        The number of moves from every cell to its nearest exit, -1 for walls and
+        cells with no way out. The field is built once, by a breadth first search run
+        backwards from every exit at once, and dropped whenever the maze changes.
+
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to build the field.
+        """
+        if self._distances is None:
+            distances: array = array('i', [-1]) * (self.rows * self.cols)
+            queue: Deque[int] = deque()
+            for position in self.end_positions:
+                distances[position.pack(self.cols)] = 0
+                queue.append(position.pack(self.cols))
+            while queue:
+                current: int = queue.popleft()
+                for neighbour in self.neighbours(current):
+                    if distances[neighbour] == -1:
+                        distances[neighbour] = distances[current] + 1
+                        queue.append(neighbour)
+            self._distances = distances
+        return self._distances
+
+    def label_components(self) -> None:
+        """
+        Labels the connected regions of the maze and keeps the labels for the lifetime of the maze,
+        relabelling lazily after the maze changes. Once labelled `find_way_out` can report there is
+        no way out in O(1) when the start and every exit are in different regions, see its fill_visited.
+
+        Complexity:
+            Best Case Complexity: O(1) if already labelled.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        self._track_components = True
+        self.component_labels
+
+    @property
+    def component_labels(self) -> array:
+        """
+        The connected region of every cell, cells share a label exactly when one can be reached from
+        the other. Walls are labelled -1. Built by flood filling the maze one region at a time.
+
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to build the labels.
+        """
+        if self._components is None:
+            cells: int = self.rows * self.cols
+            labels: array = array('i', [-1]) * cells
+            masks: bytearray = self.neighbour_masks
+            label: int = 0
+            for seed in range(cells):
+                if labels[seed] != -1 or self._is_wall(seed):
+                    continue
+                labels[seed] = label
+                stack: List[int] = [seed]
+                while stack:
+                    current: int = stack.pop()
+                    mask: int = masks[current]
+                    for bit, offset in self.neighbour_offsets:
+                        if mask & bit and labels[current + offset] == -1:
+                            labels[current + offset] = label
+                            stack.append(current + offset)
+                label += 1
+            self._components = labels
+            self._exit_components = {labels[position.pack(self.cols)] for position in self.end_positions}
+        return self._components
+
+    def has_way_out(self, position: Position) -> bool:
+        """
+        Args:
+            position(Position): The position to check.
+
+        Returns:
+            bool - True if an exit can be reached from position.
+
+        Complexity:
+            Best Case Complexity: O(1) once the components are labelled.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to label the components.
+        """
+        return self.component_labels[position.pack(self.cols)] in self._exit_components
+
+    @property
+    def junction_graph(self) -> JunctionGraph:
+        """
+        The maze with its corridors contracted, see algorithms/junction_graph.py. Nodes are the junctions,
+        dead ends, hollows, start and exits and edges hold the length and cells of the corridor between them.
+        The graph is built once, the first time it is needed, and dropped whenever the maze changes.
+
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to build the graph.
+        """
+        if self._junctions is None:
+            self._junctions = JunctionGraph(self)
+        return self._junctions
+
+    @property
+    def dead_end_fill(self) -> DeadEndFill:
+        """
+        The maze with every dead end that is not the start, an exit or a hollow sealed,
+        see algorithms/dead_end_filling.py. Built once, the first time it is needed,
+        and dropped whenever the maze changes.
+
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to fill the maze.
+        """
+        if self._dead_ends is None:
+            self._dead_ends = fill_dead_ends(self)
+        return self._dead_ends
+
+    def cluster_graph(self, cluster_size: int | None = None) -> ClusterGraph:
+        """
+        The hierarchical graph used by the hierarchical search engine, see algorithms/hierarchical_search.py.
+        The graph is built once per cluster size and only the clusters around a changed
+        cell are rebuilt when the maze changes.
+
+        Args:
+            cluster_size(int | None): The height and width of the clusters in cells, None keeps the
+            size of the graph already built or 16 if there is none.
+
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(N * S) where N is the number of cells in the maze
+            and S is cluster_size, to build the graph.
+        """
+        if self._clusters is None:
+            self._clusters = ClusterGraph(self, cluster_size or 16)
+        elif cluster_size is not None and self._clusters.cluster_size != cluster_size:
+            self._clusters = ClusterGraph(self, cluster_size)
+        return self._clusters
+
+    def _set_tile(self, position: Position, tile: str | Hollow) -> None:
+        """
+        Changes the tile of a cell, keeping the neighbour masks of the cell and its neighbours
+        and the clusters around it (see `cluster_graph`) in sync, and telling the incremental
+        planner (see `incremental_planner`) about the change.
+
+        Args:
+            position(Position): The cell to change.
+            tile(str | Hollow): The new tile of the cell.
+
+        Complexity:
+            Best Case Complexity: O(1) when no cluster graph has been built.
+            Worst Case Complexity: O(E * S^2) to rebuild the clusters around the cell, where E is the
+            number of entrance cells in those clusters and S is the cluster size.
+        """
+        self.grid[position.row][position.col].tile = tile
+        self._invalidate_caches()
+        if self._masks is None:
+            return
+        index: int = position.pack(self.cols)
+        self._masks[index] = self._cell_mask(index)
+        for row_step, col_step in self.directions.values():
+            row, col = position.row + row_step, position.col + col_step
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                self._masks[row * self.cols + col] = self._cell_mask(row * self.cols + col)
+        if self._clusters is not None:
+            self._clusters.update(index)
+        if self._planner is not None:
+            self._planner.notify(index)
+
+    def _check_editable(self, position: Position) -> None:
+        """
+        Raises:
+            ValueError: If position is outside the maze or is the start, an exit or a hollow.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if not (0 <= position.row < self.rows and 0 <= position.col < self.cols):
+            raise ValueError(f"{position} is outside the maze")
+        tile: str | Hollow = self.grid[position.row][position.col].tile
+        if tile not in (' ', Tiles.EMPTY.value, Tiles.WALL.value):
+            raise ValueError(f"Only empty cells and walls can be edited, {position} is {str(tile)!r}")
+
+    def set_wall(self, position: Position) -> None:
+        """
+        Puts a wall on an empty cell, does nothing if the cell is already a wall.
+        Everything derived from the layout is updated or rebuilt lazily, see `_set_tile`.
+
+        Args:
+            position(Position): The cell to wall up.
+
+        Raises:
+            ValueError: If position is outside the maze or is the start, an exit or a hollow.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1), plus the cost of `_set_tile` when the cell changes.
+        """
+        self._check_editable(position)
+        if not self._is_wall(position.pack(self.cols)):
+            self._set_tile(position, Tiles.WALL.value)
+
+    def clear_wall(self, position: Position) -> None:
+        """
+        Turns a wall into an empty cell, does nothing if the cell is already empty.
+
+        Args:
+            position(Position): The wall to remove.
+
+        Raises:
+            ValueError: If position is outside the maze or is the start, an exit or a hollow.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1), plus the cost of `_set_tile` when the cell changes.
+        """
+        self._check_editable(position)
+        if self._is_wall(position.pack(self.cols)):
+            self._set_tile(position, ' ')
+
+    def incremental_planner(self) -> IncrementalPlanner:
+        """
+        The D* Lite planner of this maze, see algorithms/incremental_search.py. It is created on first
+        use from the start position and kept for the lifetime of the maze, every `set_wall` and
+        `clear_wall` after that is repaired incrementally by the next `replan`.
+
+        Complexity:
+            Best Case Complexity: O(1) once created.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, to build the neighbour masks.
+        """
+        if self._planner is None:
+            self.neighbour_masks
+            self._planner = IncrementalPlanner(self, self.start_position.pack(self.cols))
+        return self._planner
+
+    def replan(self, start: Position | None = None) -> List[Position] | None:
+        """
+        Returns the current best way out after a batch of edits, repairing the previous
+        search of the incremental planner instead of searching from scratch.
+        Unlike `find_way_out` no cells are marked as visited.
+
+        Args:
+            start(Position): Where to plan from, defaults to where the planner last planned from.
+
+        Returns:
+            List[Position] | None - A shortest path from start to the nearest exit, None if there is no way out.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, when nothing relevant changed.
+            Worst Case Complexity: O(N log N) where N is the number of cells in the maze.
+        """
+        planner: IncrementalPlanner = self.incremental_planner()
+        if start is not None and start.pack(self.cols) != planner.start:
+            planner.move_to(start.pack(self.cols))
+        path: List[int] | None = planner.path()
+        if path is None:
+            return None
+        return [self.position_at(index) for index in path]
 
     def is_valid_position(self, position: Position) -> bool:
         """
@@ -197,14 +1178,17 @@ class Maze:
             bool - True if the position is within the maze and not blocked by a wall.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
         """
-        raise NotImplementedError
+        return 0 <= position.row < self.rows and 0 <= position.col < self.cols \
+            and not self._is_wall(position.pack(self.cols))
 
     def get_available_positions(self, current_position: Position) -> List[Position]:
         """
         Returns a list of all the new possible you can move to from your current position.
+        The moves are read from the precomputed neighbour mask of the cell and the
+        positions returned are the maze's shared positions, see `position_at`.
 
         Args:
             current_position (Position): Your current position.
@@ -213,17 +1197,100 @@ class Maze:
             List[Position] - A list of all the new possible you can move to from your current position.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+
+            Once the neighbour masks have been built, see `neighbour_masks`.
+        """
+        return [self.position_at(index) for index in self.neighbours(current_position.pack(self.cols))]
+
+    def mark_visited(self, index: int) -> None:
         """
+        Marks the cell at a packed cell index as visited.
 
-        raise NotImplementedError
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self.compact:
+            self._visited[index >> 3] |= 1 << (index & 7)
+        else:
+            row, col = divmod(index, self.cols)
+            self.grid[row][col].visited = True
+
+    def _is_visited(self, index: int) -> bool:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if self.compact:
+            return bool(self._visited[index >> 3] & (1 << (index & 7)))
+        row, col = divmod(index, self.cols)
+        return self.grid[row][col].visited
 
-    def find_way_out(self) -> List[Position] | None:
+    def mark_visited_bitmap(self, bitmap: bytes) -> None:
+        """
+        Marks many cells as visited at once, bit (index & 7) of byte (index >> 3) of bitmap
+        is set for every cell index to mark. Cells already visited stay visited.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+
+            For compact mazes this is a single bitwise or over the whole bitmap.
+        """
+        if self.compact:
+            merged: int = int.from_bytes(self._visited, 'little') | int.from_bytes(bitmap, 'little')
+            self._visited[:] = merged.to_bytes(len(self._visited), 'little')
+            return
+        for byte_index, byte in enumerate(bitmap):
+            while byte:
+                bit: int = byte & -byte
+                self.mark_visited((byte_index << 3) + bit.bit_length() - 1)
+                byte ^= bit
+
+    def find_way_out(self, engine: str = "bfs", start: Position | None = None, fill_visited: bool = True,
+                     fill_dead_ends: bool = False, report_sealed: bool = True) -> List[Position] | None:
         """
         Finds a way out of the maze in some cases there may be multiple exits
         or no exits at all.
 
+        The search is done by one of the engines in algorithms/maze_search.py:
+        - bfs: breadth first search, finds a shortest path.
+        - dfs: depth first search, finds any path keeping the smallest frontier.
+        - bidirectional: breadth first search from the start and all exits at once, finds a shortest path.
+        - astar: A* towards the nearest exit by Manhattan distance, finds a shortest path.
+        - distance_field: walks down `exit_distances`, finds a shortest path in O(path length)
+          once the field has been built, which makes repeated queries from different starts cheap.
+        - numpy: breadth first search over whole wavefronts with NumPy arrays, finds a shortest path.
+          Falls back to bfs when NumPy is not installed.
+        - jps: jump point search, A* expanding only jump points, finds a shortest path. Suited to open rooms.
+        - hierarchical: plans over the cached clusters of `cluster_graph` then refines the plan, finds
+          a path that may be slightly longer than the shortest. Suited to very large mazes.
+        - incremental: asks the D* Lite planner of `incremental_planner`, finds a shortest path and
+          only repairs the previous search after `set_wall` and `clear_wall`. Suited to edited mazes.
+        - junction: Dijkstra over the corridors of `junction_graph`, finds a shortest path. Suited to
+          mazes of long corridors, only the junctions it settles and the path are marked as visited.
+        Every cell expanded by the search is marked as visited. When there is no way out
+        bfs, dfs, bidirectional, astar and numpy visit every cell reachable from the start, the
+        other engines only mark what they expand: distance_field nothing, jps the jump points it
+        expands (often just the start), hierarchical and incremental nothing as they only mark the
+        path they return, junction only the junctions it settles.
+
+        Args:
+            engine(str): The name of the search engine to use.
+            start(Position): Where to search from, defaults to the start position of the maze.
+            fill_visited(bool): When False and the maze has been labelled (see `label_components`),
+                return None straight away if no exit is in the same region as start, leaving
+                the cells unvisited. When True the search always runs and marks cells as visited.
+            fill_dead_ends(bool): Search the maze with its dead ends sealed, see `dead_end_fill`.
+                Only the engines that read nothing but the neighbour masks support it (bfs, dfs,
+                bidirectional, astar, numpy and jps). Ignored when start is itself sealed.
+            report_sealed(bool): With fill_dead_ends, also mark as visited every sealed cell hanging
+                off a visited cell, so that the engines which visit every cell reachable from the start
+                when there is no way out (all but jps) still do so on the filled maze.
+
         Returns:
             List[Position]: If there is a way out of the maze, 
             the path will be made up of the coordinates starting at 
@@ -231,12 +1298,40 @@ class Maze:
 
             None: Unable to find a path to the exit, simply return None.
 
+        Raises:
+            ValueError: If engine is not a known search engine, or does not support fill_dead_ends.
+
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(1) when the start position is an exit.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze (O(N log N) for astar).
         """
-        start: Position = self.start_position
-        raise NotImplementedError
+        search: SearchEngine | None = ENGINES.get(engine)
+        if search is None:
+            raise ValueError(f"Unknown search engine {engine}, expected one of {list(ENGINES)}")
+        if start is None:
+            start = self.start_position
+        if not fill_visited and self._track_components and not self.has_way_out(start):
+            return None
+        if fill_dead_ends and engine not in DEAD_END_ENGINES:
+            raise ValueError(f"The {engine} engine cannot search a filled maze, expected one of {sorted(DEAD_END_ENGINES)}")
+        if fill_dead_ends and not self.dead_end_fill.flags[start.pack(self.cols)]:
+            # The engines only see the maze through its neighbour masks, they search the filled masks instead.
+            masks: bytearray = self.neighbour_masks
+            self._masks = self.dead_end_fill.masks
+            try:
+                path: List[int] | None = search(self, start.pack(self.cols))
+            finally:
+                self._masks = masks
+            if report_sealed:
+                # Cells are sealed leaf first, so walking backwards reaches every parent before its children.
+                for index, parent in zip(reversed(self.dead_end_fill.sealed), reversed(self.dead_end_fill.parents)):
+                    if parent != -1 and self._is_visited(parent):
+                        self.mark_visited(index)
+        else:
+            path = search(self, start.pack(self.cols))
+        if path is None:
+            return None
+        return [self.position_at(index) for index in path]
 
     def take_treasures(self, path: List[MazeCell], backpack_capacity: int) -> List[Treasure] | None:
         """
@@ -258,11 +1353,184 @@ class Maze:
             None - If there are no treasures to take.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(P) where P is the length of the path, when it passes no hollows.
+            Worst Case Complexity: O(P * get_optimal_treasure) where P is the length of the path,
+            when every cell of the path is a hollow.
+
+        """
+        taken: List[Treasure] = []
+        for cell in path:
+            if isinstance(cell.tile, Hollow):
+                treasure: Treasure | None = cell.tile.get_optimal_treasure(backpack_capacity)
+                if treasure is not None:
+                    taken.append(treasure)
+                    backpack_capacity -= treasure.weight
+        return taken or None
+
+    def evaluate_take_treasures(self, path: Iterable[MazeCell | int], backpack_capacities: List[int]) -> List[List[Treasure] | None]:
+        """
+        What take_treasures would return for each of many backpack capacities along the same path,
+        without taking anything: no hollow is changed, so there is no need to refill and restructure
+        the hollows between capacities. The path is read once, every capacity advancing together.
+
+        Args:
+            path(Iterable[MazeCell | int]): The cells of the path, or their packed cell indices, in order.
+            backpack_capacities(List[int]): The backpack capacities to evaluate.
+
+        Returns:
+            List[List[Treasure] | None] - For each capacity, in the same order, the result take_treasures
+            would give with the hollows as they are now.
+
+        Complexity:
+            Best Case Complexity: O(P + C) where P is the length of the path and C the number of
+            capacities, when the path passes no hollow.
+            Worst Case Complexity: O(P + H * R + V * C * n) where H is the number of distinct hollows on the path,
+            R the cost of `ranked_treasures`, V the number of hollow cells on the path and n the number
+            of treasures in a hollow.
+        """
+        ranked: RankedHollows = RankedHollows()
+        remaining: List[int] = list(backpack_capacities)
+        taken: List[set[int]] = [set() for _ in backpack_capacities]
+        results: List[List[Treasure]] = [[] for _ in backpack_capacities]
+        for cell in path:
+            hollow: Hollow | None = self.hollow_at(cell) if isinstance(cell, int) \
+                else cell.tile if isinstance(cell.tile, Hollow) else None
+            if hollow is None:
+                continue
+            for run in range(len(remaining)):
+                treasure: Treasure | None = ranked.choose(hollow, remaining[run], taken[run])
+                if treasure is not None:
+                    taken[run].add(id(treasure))
+                    results[run].append(treasure)
+                    remaining[run] -= treasure.weight
+        return [result or None for result in results]
+
+    def iter_treasures(self, path: Iterable[MazeCell | int], backpack_capacity: int) -> Iterator[Treasure]:
+        """
+        Streaming take_treasures, takes the same treasures in the same order but reads the path one
+        cell at a time and yields each treasure as soon as it is taken. The path can be any iterable
+        of cells or packed cell indices, a generator is only read as far as needed: reading stops once
+        the backpack can't fit the lightest treasure left in any hollow of the maze, so a backpack that
+        fits nothing to begin with reads no cell at all.
+
+        Before the first cell the hollows are only looked at until one holds a treasure that fits. After
+        that the lightest treasures of the maze are only looked up once the backpack can't fit the lightest
+        treasure left in the hollow it was just filled from. A lazy hollow that hasn't generated its
+        treasures yet is never filled to find out, reading carries on while it holds them.
+
+        Args:
+            path(Iterable[MazeCell | int]): The cells of the path you took, in order.
+            backpack_capacity(int): The maximum weight you can carry.
+
+        Returns:
+            Iterator[Treasure] - The treasures taken, in the order they are taken.
+
+        Complexity:
+            Best Case Complexity: O(P * get_optimal_treasure) where P is the number of cells read,
+            when the first hollow looked at holds a treasure that fits and the backpack always fits
+            something left in the hollow it was just filled from.
+            Worst Case Complexity: O(H + T + P * get_optimal_treasure + K * (n + H)) where H is the
+            number of hollows (O(N) to find them, where N is the number of cells, in a maze that isn't
+            compact), T the number of treasures in them, K the number of treasures taken and n the
+            number of treasures in a hollow.
+        """
+        if all(weight > backpack_capacity for _, weight in self._lightest_treasures()):
+            return
+        # The lightest treasure left in each hollow holding any, built the first time it is needed.
+        lightest: dict[int, int] | None = None
+        for cell in path:
+            hollow: Hollow | None = self.hollow_at(cell) if isinstance(cell, int) \
+                else cell.tile if isinstance(cell.tile, Hollow) else None
+            if hollow is None:
+                continue
+            treasure: Treasure | None = hollow.get_optimal_treasure(backpack_capacity)
+            if treasure is None:
+                continue
+            backpack_capacity -= treasure.weight
+            yield treasure
+            weight: int | None = hollow.lightest_weight()
+            if lightest is None:
+                if weight is not None and weight <= backpack_capacity:
+                    continue
+                lightest = dict(self._lightest_treasures())
+            elif weight is None:
+                lightest.pop(id(hollow), None)
+            else:
+                lightest[id(hollow)] = weight
+            floor: int | None = min(lightest.values(), default=None)
+            if floor is None or backpack_capacity < floor:
+                return
+
+    def _lightest_treasures(self) -> Iterator[tuple[int, int]]:
+        """
+        Returns:
+            Iterator[tuple[int, int]] - The id of each hollow holding any treasure with the weight of the
+            lightest treasure left in it, the mystical hollow is only given once. A lazy hollow that hasn't
+            generated its treasures yet is given 0 rather than being filled.
+
+        Complexity:
+            Best Case Complexity: O(H * lightest_weight) where H is the number of hollows.
+            Worst Case Complexity: O(N + H * lightest_weight) where N is the number of cells, in a maze that isn't compact.
+        """
+        if self.compact:
+            hollows: Iterable[Hollow] = self._hollows.values()
+        else:
+            hollows = (cell.tile for row in self.grid for cell in row if isinstance(cell.tile, Hollow))
+        seen: set[int] = set()
+        for hollow in hollows:
+            if id(hollow) in seen:
+                continue
+            seen.add(id(hollow))
+            if isinstance(hollow, LazySpookyHollow) and not hollow.materialised:
+                yield id(hollow), 0
+                continue
+            weight: int | None = hollow.lightest_weight()
+            if weight is not None:
+                yield id(hollow), weight
+
+    @property
+    def route_distances(self) -> RouteDistances:
+        """
+        The number of moves between the start, every hollow and every exit, along walks that pass
+        no other hollow, see algorithms/treasure_route.py. Built once, the first time it is needed,
+        and dropped whenever the maze changes.
 
+        Complexity:
+            Best Case Complexity: O(1) once built.
+            Worst Case Complexity: O(H * N) where H is the number of hollows and N the number of cells
+            in the maze, to build the distances.
+        """
+        if self._route_distances is None:
+            self._route_distances = RouteDistances(self)
+        return self._route_distances
+
+    def plan_treasure_route(self, backpack_capacity: int, max_steps: int | None = None) -> TreasureRoute | None:
+        """
+        Chooses the way out that lets `take_treasures` collect the most treasure value, see
+        algorithms/treasure_route.py. Taking treasures along the route returned, for example with
+        `take_treasures([self.grid[p.row][p.col] for p in route.path], backpack_capacity)`,
+        takes exactly route.treasures. Planning leaves the hollows and visited cells unchanged.
+
+        Args:
+            backpack_capacity(int): The maximum weight you can carry.
+            max_steps(int | None): The most moves the route may take, None for no limit.
+
+        Returns:
+            TreasureRoute | None - The most valuable route, the shortest of them on ties,
+            None if no exit can be reached within max_steps.
+
+        Complexity:
+            Best Case Complexity: O(H * T) where H is the number of hollows and T the number of
+            treasures in a hollow, once `route_distances` is built and no hollow can be reached.
+            Worst Case Complexity: O(H! * H * T + N) where N is the number of cells in the maze,
+            when the pruning cuts no route. The search is exponential in the number of hollows.
         """
-        raise NotImplementedError
+        planned: Tuple[List[int], List[Treasure]] | None = plan_route(self, self.route_distances,
+                                                                       backpack_capacity, max_steps)
+        if planned is None:
+            return None
+        path, treasures = planned
+        return TreasureRoute([self.position_at(index) for index in path], treasures)
 
     def __repr__(self) -> str:
         return str(self)
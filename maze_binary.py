@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+"""
+Binary maze file format.
+
+Layout (all integers little endian):
+    header      magic (4s), version (H), reserved (H), rows (I), cols (I),
+                start index (Q), exit count (I), hollow count (I)
+    exit table  one cell index (Q) per exit
+    hollow table one cell index (Q) per hollow, in row major order
+    tile plane  rows * cols tile codes, one byte per cell in row major order
+
+A cell index is row * cols + col. The tile plane uses the same codes as the compact
+grid in maze.py, so it can be handed to a compact maze without being decoded.
+"""
+
+import mmap
+import struct
+from typing import List
+
+from config import Tiles
+
+MAGIC: bytes = b"MAZB"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sHHIIQII")
+INDEX: struct.Struct = struct.Struct("<Q")
+# Every code the tile plane may hold, empty cells are stored as spaces.
+TILE_CODES: bytes = b" " + "".join(tile.value for tile in Tiles if tile != Tiles.EMPTY).encode()
+
+
+def write_binary_maze(path: str, rows: int, cols: int, start: int, exits: List[int], hollows: List[int], tiles: bytes) -> None:
+    """
+    Writes a maze in the binary format.
+
+    Args:
+        path(str): The file to write to.
+        rows(int): Number of rows in the maze.
+        cols(int): Number of columns in the maze.
+        start(int): Cell index of the start position.
+        exits(List[int]): Cell indices of the exits.
+        hollows(List[int]): Cell indices of the hollows in row major order.
+        tiles(bytes): The tile plane of the maze.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is the number of cells in the maze.
+        Worst Case Complexity: O(N) where N is the number of cells in the maze.
+    """
+    if len(tiles) != rows * cols:
+        raise ValueError(f"Expected {rows * cols} tiles got {len(tiles)}")
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, rows, cols, start, len(exits), len(hollows)))
+        f.write(struct.pack(f"<{len(exits)}Q", *exits))
+        f.write(struct.pack(f"<{len(hollows)}Q", *hollows))
+        f.write(tiles)
+
+
+class BinaryMazeFile:
+    """
+    A memory mapped binary maze. Opening the file only decodes the header,
+    exit table and hollow table, the tile plane is exposed as a zero copy memoryview.
+
+    The mapping is copy on write, changes made through `tiles` are private to
+    this process and are never written back to the file.
+    """
+
+    def __init__(self, path: str, validate: bool = False) -> None:
+        """
+        Args:
+            path(str): The binary maze file to open.
+            validate(bool): Whether to also scan the tile plane for unknown tile codes.
+
+        Raises:
+            ValueError: If the file is not a valid binary maze, is truncated, holds a cell index
+            outside the maze or, when validating, an unknown tile code.
+
+        Complexity:
+            Best Case Complexity: O(E + H) where E is the number of exits and H the number of hollows.
+            Worst Case Complexity: O(N + E + H) where N is the number of cells in the maze, when validating.
+        """
+        with open(path, 'rb') as f:
+            try:
+                self._mapping: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            except ValueError:
+                raise ValueError(f"{path} is not a binary maze file") from None
+        if len(self._mapping) < HEADER.size:
+            raise ValueError(f"{path} is not a binary maze file")
+        magic, version, _, self.rows, self.cols, self.start, exit_count, hollow_count = HEADER.unpack_from(self._mapping)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary maze file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary maze version {version} in {path}")
+
+        cells: int = self.rows * self.cols
+        offset: int = HEADER.size
+        if len(self._mapping) != offset + (exit_count + hollow_count) * INDEX.size + cells:
+            raise ValueError(f"Truncated or oversized binary maze {path}")
+        self.exits: List[int] = list(struct.unpack_from(f"<{exit_count}Q", self._mapping, offset))
+        offset += exit_count * INDEX.size
+        self.hollows: List[int] = list(struct.unpack_from(f"<{hollow_count}Q", self._mapping, offset))
+        offset += hollow_count * INDEX.size
+        if self.start >= cells or any(index >= cells for index in self.exits) or any(index >= cells for index in self.hollows):
+            raise ValueError(f"Cell index outside the {self.rows} x {self.cols} maze in {path}")
+        self.tiles: memoryview = memoryview(self._mapping)[offset:]
+        if validate:
+            # Scanned a chunk at a time so the tile plane is never copied whole.
+            for chunk in range(0, cells, mmap.PAGESIZE * 16):
+                if bytes(self.tiles[chunk:chunk + mmap.PAGESIZE * 16]).translate(None, TILE_CODES):
+                    raise ValueError(f"Unknown tile code in {path}")
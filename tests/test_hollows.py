@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import threading
+from fractions import Fraction
+from typing import List
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from hollows import ConcurrentMysticalHollow, Hollow, LazySpookyHollow, MysticalHollow, SpookyHollow
+from maze import Maze
+from random_gen import RandomGen
+from treasure import Treasure, TreasureBatch, generate_treasures, generate_unique_treasures
+
+
+class TestHollows(TestCase):
+    @number("7.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_checkpoint_rollback(self) -> None:
+        treasures: List[Treasure] = [Treasure(41, 42), Treasure(66, 1), Treasure(7, 73), Treasure(56, 51), Treasure(60, 38)]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        for hollow in (SpookyHollow(), MysticalHollow()):
+            outer: int = hollow.checkpoint()
+            self.assertEqual(hollow.get_optimal_treasure(100), Treasure(66, 1))
+            inner: int = hollow.checkpoint()
+            self.assertEqual(hollow.get_optimal_treasure(50), Treasure(60, 38))
+            self.assertEqual(hollow.get_optimal_treasure(50), Treasure(41, 42))
+            self.assertEqual(len(hollow), 2)
+
+            hollow.rollback(inner)
+            self.assertEqual(len(hollow), 4)
+            self.assertEqual(hollow.get_optimal_treasure(50), Treasure(60, 38))
+            hollow.rollback(outer)
+            self.assertEqual(hollow.ranked_treasures(), [Treasure(66, 1), Treasure(60, 38), Treasure(56, 51),
+                                                         Treasure(41, 42), Treasure(7, 73)])
+
+            # Refilling the hollow drops its checkpoints
+            hollow.treasures = list(treasures)
+            hollow.restructure_hollow()
+            with self.assertRaises(ValueError):
+                hollow.rollback(outer)
+
+    @number("7.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_rollback_shared_mystical_hollow(self) -> None:
+        treasures: List[Treasure] = [Treasure(90, 28), Treasure(32, 11), Treasure(96, 13), Treasure(51, 6)]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        maze: Maze = Maze.load_maze_from_file("task3/treasures/maze2.txt")
+        path: list = [maze.grid[1][col] for col in range(1, 9)]
+        mystical: MysticalHollow = maze.grid[1][2].tile
+        token: int = mystical.checkpoint()
+        self.assertEqual(maze.take_treasures(path, 31), [Treasure(51, 6), Treasure(96, 13), Treasure(32, 11)])
+        mystical.rollback(token)
+        self.assertEqual(maze.take_treasures(path, 31), [Treasure(51, 6), Treasure(96, 13), Treasure(32, 11)])
+
+    @number("7.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_concurrent_mystical_hollow(self) -> None:
+        treasures: List[Treasure] = [Treasure(value, weight) for value, weight in
+                                     zip(range(1, 401), [(7 * k) % 97 + 1 for k in range(400)])]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        maze: Maze = Maze.load_maze_from_file("task3/treasures/maze2.txt", thread_safe=True)
+        mystical: Hollow = maze.grid[1][2].tile
+        self.assertIsInstance(mystical, ConcurrentMysticalHollow)
+        self.assertIsInstance(maze.clone().grid[1][2].tile, ConcurrentMysticalHollow)
+        self.assertNotIsInstance(Maze.load_maze_from_file("task3/treasures/maze2.txt").grid[1][2].tile,
+                                 ConcurrentMysticalHollow)
+
+        taken: List[List[Treasure]] = [[] for _ in range(8)]
+
+        def explore(share: List[Treasure], capacity: int) -> None:
+            while (treasure := mystical.get_optimal_treasure(capacity) or mystical.get_optimal_treasure(100)) is not None:
+                share.append(treasure)
+
+        workers: List[threading.Thread] = [threading.Thread(target=explore, args=(share, 10 * k + 5))
+                                           for k, share in enumerate(taken)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        handed_out: List[Treasure] = [treasure for share in taken for treasure in share]
+        self.assertEqual(len(mystical), 0)
+        self.assertEqual(len(handed_out), len(treasures))
+        self.assertEqual({id(treasure) for treasure in handed_out}, {id(treasure) for treasure in treasures})
+
+    @number("7.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_spooky_hollow_small_capacities(self) -> None:
+        # The heaviest treasures have the best ratios, so small backpacks have to skip most of the hollow
+        treasures: List[Treasure] = [Treasure(weight * weight + 1, weight) for weight in range(1, 2001)]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        hollow: SpookyHollow = SpookyHollow()
+        remaining: List[Treasure] = list(treasures)
+        for capacity in (3, 1, 50, 2, 1000, 3, 0, 7):
+            fits: List[Treasure] = [treasure for treasure in remaining if treasure.weight <= capacity]
+            expected: Treasure | None = max(fits, key=lambda treasure: treasure.value / treasure.weight, default=None)
+            self.assertIs(hollow.get_optimal_treasure(capacity), expected)
+            if expected is not None:
+                remaining.remove(expected)
+            self.assertEqual(hollow.lightest_weight(), min(treasure.weight for treasure in remaining))
+        self.assertEqual(len(hollow), len(remaining))
+        # Taking never leaves the tree more than 1.44 log2(n) high
+        self.assertLessEqual(hollow.treasures.root.height, 16)
+
+    @number("7.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_mystical_hollow_weight_buckets(self) -> None:
+        treasures: List[Treasure] = [Treasure(weight * weight + 1, weight) for weight in range(1, 300, 3)]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        hollow: MysticalHollow = MysticalHollow()
+        remaining: List[Treasure] = list(treasures)
+        token: int = hollow.checkpoint()
+        for capacity in (0, 1, 5, 64, 63, 300, 9, 128, 2, 130):
+            fits: List[Treasure] = [treasure for treasure in remaining if treasure.weight <= capacity]
+            expected: Treasure | None = max(fits, key=lambda treasure: treasure.value / treasure.weight, default=None)
+            self.assertIs(hollow.get_optimal_treasure(capacity), expected)
+            if expected is not None:
+                remaining.remove(expected)
+            self.assertEqual(len(hollow), len(remaining))
+            self.assertEqual(hollow.lightest_weight(), min(treasure.weight for treasure in remaining))
+        hollow.rollback(token)
+        self.assertEqual(len(hollow), len(treasures))
+        self.assertIs(hollow.get_optimal_treasure(64), treasures[21])
+
+    @number("7.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_lazy_spooky_hollows(self) -> None:
+        def treasure_gen(_): return generate_treasures()
+        Hollow.gen_treasures = treasure_gen
+
+        def load() -> List[LazySpookyHollow]:
+            RandomGen.set_seed(1008)
+            maze: Maze = Maze.load_maze_from_file("task3/treasures/maze1.txt", lazy=True)
+            return [cell.tile for row in maze.grid for cell in row if isinstance(cell.tile, LazySpookyHollow)]
+
+        forward: List[LazySpookyHollow] = load()
+        self.assertEqual(len(forward), 2)
+        self.assertFalse(any(hollow.materialised for hollow in forward))
+        seed: int = RandomGen.seed
+        first: Treasure | None = forward[0].get_optimal_treasure(100)
+        self.assertIsNotNone(first)
+        self.assertTrue(forward[0].materialised)
+        self.assertFalse(forward[1].materialised)
+        self.assertEqual(RandomGen.seed, seed)
+
+        # Opening the hollows in the other order, after drawing more numbers, generates the same treasures
+        backward: List[LazySpookyHollow] = load()
+        RandomGen.random()
+        sizes: List[int] = [len(backward[1]), len(backward[0])]
+        self.assertEqual(sizes, [len(forward[1]), len(forward[0]) + 1])
+        self.assertEqual(backward[1].ranked_treasures(), forward[1].ranked_treasures())
+        self.assertEqual(backward[0].get_optimal_treasure(100), first)
+
+        # Emptying the mystical hollow doesn't fill the spooky hollows to find the lightest treasure left
+        RandomGen.set_seed(1008)
+        maze: Maze = Maze.load_maze_from_file("task3/treasures/maze1.txt", lazy=True)
+        mystical: Hollow = maze.grid[2][1].tile
+        mystical.treasures = [Treasure(10, 5)]
+        mystical.restructure_hollow()
+        self.assertEqual(list(maze.iter_treasures([maze.grid[2][1]], 5)), [Treasure(10, 5)])
+        self.assertFalse(any(cell.tile.materialised for row in maze.grid for cell in row
+                             if isinstance(cell.tile, LazySpookyHollow)))
+
+    @number("7.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_generate_unique_treasures(self) -> None:
+        # Every value and weight of the range is used, so no draw can be thrown away
+        for number_of_treasures, low, high in ((30, 1, 30), (5000, 1, 10 ** 9), (2, 2, 3)):
+            RandomGen.set_seed(number_of_treasures)
+            treasures: List[Treasure] = generate_unique_treasures(number_of_treasures, high, high, low, low)
+            self.assertEqual(len(treasures), number_of_treasures)
+            self.assertEqual(len({treasure.value for treasure in treasures}), number_of_treasures)
+            self.assertEqual(len({treasure.weight for treasure in treasures}), number_of_treasures)
+            self.assertEqual(len({Fraction(treasure.value, treasure.weight) for treasure in treasures}), number_of_treasures)
+            self.assertTrue(all(low <= treasure.value <= high and low <= treasure.weight <= high for treasure in treasures))
+            RandomGen.set_seed(number_of_treasures)
+            self.assertEqual(generate_unique_treasures(number_of_treasures, high, high, low, low), treasures)
+
+        with self.assertRaises(ValueError):
+            generate_unique_treasures(31, 30, 100)
+        with self.assertRaises(ValueError):
+            generate_unique_treasures(2, 10, 10, min_weight=0)
+
+    @number("7.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_treasure_batch(self) -> None:
+        RandomGen.set_seed(25)
+        treasures: List[Treasure] = generate_unique_treasures(200, 1000, 1000)
+        batch: TreasureBatch = TreasureBatch.from_treasures(treasures)
+        self.assertFalse(hasattr(treasures[0], "__dict__"))
+        self.assertEqual(len(batch), len(treasures))
+        self.assertEqual(list(batch), treasures)
+        self.assertEqual(batch[7], treasures[7])
+        with self.assertRaises(AttributeError):
+            batch[7].value = 1
+
+        capacities: List[int] = [5, 400, 20, 1, 80, 1000, 3, 250] * 5
+        for make in (SpookyHollow, MysticalHollow):
+            expected: Hollow = make()
+            expected.treasures = list(treasures)
+            expected.restructure_hollow()
+            for ranked in (False, True):
+                hollow: Hollow = make()
+                hollow.treasures = TreasureBatch.from_treasures(treasures, rank=ranked)
+                hollow.restructure_hollow()
+                self.assertEqual(len(hollow), len(treasures))
+                self.assertEqual(hollow.ranked_treasures(), expected.ranked_treasures())
+                self.assertEqual([hollow.get_optimal_treasure(capacity) for capacity in capacities],
+                                 [expected.get_optimal_treasure(capacity) for capacity in capacities])
+                expected.treasures = list(treasures)
+                expected.restructure_hollow()
+
+    @number("7.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_stale_checkpoints(self) -> None:
+        treasures: List[Treasure] = [Treasure(41, 42), Treasure(66, 1), Treasure(7, 73), Treasure(56, 51), Treasure(60, 38)]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        for hollow in (SpookyHollow(), MysticalHollow(), ConcurrentMysticalHollow()):
+            first: int = hollow.checkpoint()
+            hollow.get_optimal_treasure(100)
+            hollow.get_optimal_treasure(100)
+            second: int = hollow.checkpoint()
+            hollow.get_optimal_treasure(100)
+            hollow.rollback(first)
+            hollow.get_optimal_treasure(100)
+            hollow.get_optimal_treasure(100)
+            # Rolling back to the first checkpoint dropped the second, its token must not be reused
+            with self.assertRaises(ValueError):
+                hollow.rollback(second)
+            self.assertEqual(len(hollow), 3)
+            hollow.rollback(first)
+            self.assertEqual(len(hollow), 5)
+
+        # Hollows without checkpoints don't have to know how to put treasures back
+        class PlainHollow(Hollow):
+            def restructure_hollow(self) -> None:
+                pass
+
+            def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
+                return None
+
+        self.assertEqual(len(PlainHollow()), 5)
+
+    @number("7.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_checkpoint_before_lazy_fill(self) -> None:
+        treasures: List[Treasure] = [Treasure(41, 42), Treasure(66, 1), Treasure(7, 73), Treasure(56, 51), Treasure(60, 38)]
+        def treasure_gen(_): return list(treasures)
+        Hollow.gen_treasures = treasure_gen
+
+        hollow: LazySpookyHollow = LazySpookyHollow(42)
+        token: int = hollow.checkpoint()
+        self.assertFalse(hollow.materialised)
+        self.assertEqual(hollow.get_optimal_treasure(100), Treasure(66, 1))
+        self.assertTrue(hollow.materialised)
+        hollow.rollback(token)
+        self.assertEqual(len(hollow), len(treasures))
+        self.assertEqual(hollow.get_optimal_treasure(100), Treasure(66, 1))
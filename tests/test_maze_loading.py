@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from maze import Maze, MazeCell, MazeLayout, MazeLoadCache, Position
+from maze_binary import HEADER, INDEX, BinaryMazeFile
+
+
+class TestMazeLoading(TestCase):
+    @number("4.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_scan_layout(self) -> None:
+        layout: MazeLayout = Maze._scan_maze_file("task3/maze4.txt")
+        self.assertEqual((layout.rows, layout.cols), (6, 13))
+        self.assertEqual(layout.start_position, Position(4, 1))
+        self.assertEqual(layout.end_positions, [Position(1, 5), Position(1, 6)])
+        self.assertEqual(layout.hollows, [("M", Position(3, 1)), ("S", Position(4, 2))])
+
+    @number("4.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_invalid_files_report_location(self) -> None:
+        expected: dict[str, str] = {
+            "invalid/uneven_columns.txt": "Uneven columns in invalid/uneven_columns.txt ensure all rows have the same number of columns (row 2, column 4)",
+            "invalid/invalid_tile.txt": "Invalid tile(s) found in invalid/invalid_tile.txt (['x']) (row 2, column 2)",
+            "invalid/multiple_starts.txt": "Multiple start positions found in invalid/multiple_starts.txt (row 2, column 2)",
+            "invalid/no_treasures.txt": "No treasures found in invalid/no_treasures.txt",
+        }
+        for maze_name, message in expected.items():
+            with self.assertRaises(ValueError) as context:
+                Maze.validate_maze_file(maze_name)
+            self.assertEqual(str(context.exception), message)
+
+    @number("4.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_compact_grid_views(self) -> None:
+        layout: MazeLayout = Maze._scan_maze_file("task3/visit_all.txt")
+        walls: List[Position] = [Position(*divmod(index, layout.cols))
+                                 for index, code in enumerate(layout.tiles) if code == ord("#")]
+        regular: Maze = Maze(layout.start_position, layout.end_positions, walls, [], layout.rows, layout.cols)
+        compact: Maze = Maze(layout.start_position, layout.end_positions, walls, [], layout.rows, layout.cols, compact=True)
+        self.assertEqual(str(compact), str(regular))
+        self.assertEqual(len(compact.grid), len(regular.grid))
+        for regular_row, compact_row in zip(regular.grid, compact.grid):
+            for regular_cell, compact_cell in zip(regular_row, compact_row):
+                self.assertEqual(compact_cell.tile, regular_cell.tile)
+                self.assertEqual(compact_cell.position, regular_cell.position)
+                self.assertFalse(compact_cell.visited)
+
+        cell: MazeCell = compact.grid[3][5]
+        cell.visited = True
+        self.assertTrue(compact.grid[3][5].visited, "Visited should be stored in the maze, not the view")
+        self.assertFalse(compact.grid[3][6].visited)
+        compact.grid[3][5].visited = False
+        self.assertFalse(compact.grid[3][5].visited)
+
+    @number("4.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_binary_round_trip(self) -> None:
+        with TemporaryDirectory(dir="mazes") as directory:
+            name: str = os.path.basename(directory)
+            Maze.convert_to_binary("task3/maze4.txt", f"{name}/maze4.mzb")
+            maze_file: BinaryMazeFile = BinaryMazeFile(f"mazes/{name}/maze4.mzb")
+            original: MazeLayout = Maze._scan_maze_file("task3/maze4.txt")
+            self.assertEqual((maze_file.rows, maze_file.cols), (original.rows, original.cols))
+            self.assertEqual(maze_file.start, original.start_position.row * original.cols + original.start_position.col)
+            self.assertEqual(bytes(maze_file.tiles), bytes(original.tiles))
+            del maze_file
+
+            Maze.convert_to_text(f"{name}/maze4.mzb", f"{name}/maze4.txt")
+            round_trip: MazeLayout = Maze._scan_maze_file(f"{name}/maze4.txt")
+            self.assertEqual(round_trip, original)
+
+            with open(f"mazes/{name}/not_a_maze.mzb", "wb") as f:
+                f.write(b"#P.E#")
+            with self.assertRaises(ValueError):
+                BinaryMazeFile(f"mazes/{name}/not_a_maze.mzb")
+
+    @number("4.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_load_cache_clones(self) -> None:
+        Maze.load_cache = MazeLoadCache(max_size=1)
+        try:
+            first: Maze = Maze.load_maze_from_file("task3/treasures/maze2.txt")
+            first.grid[1][1].visited = True
+            second: Maze = Maze.load_maze_from_file("task3/treasures/maze2.txt")
+            self.assertEqual((Maze.load_cache.hits, Maze.load_cache.misses), (1, 1))
+            self.assertEqual(str(first), str(second))
+            self.assertFalse(second.grid[1][1].visited, "Cached mazes should be returned unvisited")
+            self.assertIsNot(second.grid[1][2].tile, first.grid[1][2].tile, "Hollows should be cloned")
+            self.assertIs(second.grid[1][2].tile, second.grid[1][3].tile, "Mystical hollows should stay shared")
+
+            Maze.load_maze_from_file("sample.txt")
+            self.assertEqual(len(Maze.load_cache), 1)
+            Maze.load_maze_from_file("task3/treasures/maze2.txt")
+            self.assertEqual(Maze.load_cache.misses, 3, "The least recently used maze should have been evicted")
+        finally:
+            Maze.load_cache = None
+
+    @number("4.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_binary_corrupt_files(self) -> None:
+        with TemporaryDirectory(dir="mazes") as directory:
+            name: str = os.path.basename(directory)
+            Maze.convert_to_binary("task3/maze4.txt", f"{name}/maze4.mzb")
+            with open(f"mazes/{name}/maze4.mzb", "rb") as f:
+                data: bytes = f.read()
+            magic, version, reserved, rows, cols, start, exit_count, hollow_count = HEADER.unpack_from(data)
+            tiles_at: int = HEADER.size + (exit_count + hollow_count) * INDEX.size
+            corrupt: dict[str, bytes] = {
+                # Cut inside the exit table, before the tile plane
+                "truncated": data[:HEADER.size + 4],
+                "trailing": data + b" ",
+                "start": HEADER.pack(magic, version, reserved, rows, cols, 10 ** 6, exit_count, hollow_count) + data[HEADER.size:],
+                "exit": data[:HEADER.size] + INDEX.pack(rows * cols) + data[HEADER.size + INDEX.size:],
+            }
+            for kind, contents in corrupt.items():
+                with open(f"mazes/{name}/{kind}.mzb", "wb") as f:
+                    f.write(contents)
+                with self.assertRaises(ValueError, msg=kind):
+                    BinaryMazeFile(f"mazes/{name}/{kind}.mzb")
+                with self.assertRaises(ValueError, msg=kind):
+                    Maze.load_maze_from_binary(f"{name}/{kind}.mzb")
+
+            # The tile plane is only scanned for unknown codes when asked to, opening stays O(header)
+            with open(f"mazes/{name}/tile.mzb", "wb") as f:
+                f.write(data[:tiles_at] + b"X" + data[tiles_at + 1:])
+            self.assertEqual(BinaryMazeFile(f"mazes/{name}/tile.mzb").tiles[0], ord("X"))
+            self.assertIsNotNone(BinaryMazeFile(f"mazes/{name}/maze4.mzb", validate=True))
+            with self.assertRaises(ValueError):
+                BinaryMazeFile(f"mazes/{name}/tile.mzb", validate=True)
+            with self.assertRaises(ValueError):
+                Maze.load_maze_from_binary(f"{name}/tile.mzb", validate=True)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from algorithms.hierarchical_search import ClusterGraph
+from algorithms.junction_graph import JunctionGraph
+from algorithms.maze_search import ENGINES
+from maze import Maze, MazeLayout, Position
+
+
+class TestMazeSearch(TestCase):
+    @staticmethod
+    def load_without_hollows(maze_name: str, compact: bool = False) -> Maze:
+        # Builds the maze straight from its layout so these tests don't depend on the hollows.
+        layout: MazeLayout = Maze._scan_maze_file(maze_name)
+        walls: List[Position] = [Position.unpack(index, layout.cols)
+                                 for index, code in enumerate(layout.tiles) if code == ord("#")]
+        return Maze(layout.start_position, layout.end_positions, walls, [], layout.rows, layout.cols, compact)
+
+    @number("5.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_position_values(self) -> None:
+        self.assertEqual(len({Position(1, 2), Position(1, 2), Position(2, 1)}), 2)
+        self.assertEqual(Position(3, 4).pack(10), 34)
+        self.assertEqual(Position.unpack(34, 10), Position(3, 4))
+        with self.assertRaises(AttributeError):
+            Position(0, 0).layer = 1
+
+        maze: Maze = self.load_without_hollows("task3/maze4.txt")
+        self.assertIs(maze.position_at(14), maze.position_at(14))
+        self.assertEqual(maze.position_at(14), Position(1, 1))
+        self.assertTrue(maze.is_exit(Position(1, 6)))
+        self.assertTrue(maze.is_exit(Position(1, 5).pack(maze.cols)))
+        self.assertFalse(maze.is_exit(maze.start_position))
+
+    @number("5.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_neighbour_masks(self) -> None:
+        for compact in (False, True):
+            maze: Maze = self.load_without_hollows("task3/maze1.txt", compact)
+            for index in range(maze.rows * maze.cols):
+                self.assertEqual(maze.neighbour_masks[index], maze._cell_mask(index))
+            self.assertEqual(set(maze.get_available_positions(Position(4, 1))), {Position(3, 1), Position(4, 2)})
+            self.assertEqual(list(maze.neighbours(Position(3, 4).pack(maze.cols))),
+                             [Position(2, 4).pack(maze.cols), Position(4, 4).pack(maze.cols),
+                              Position(3, 3).pack(maze.cols), Position(3, 5).pack(maze.cols)])
+
+            # Walls placed after the masks are built must update the cell and its neighbours
+            maze._set_tile(Position(3, 1), "#")
+            self.assertEqual(maze.get_available_positions(Position(4, 1)), [Position(4, 2)])
+            self.assertEqual(maze.neighbour_masks[Position(3, 1).pack(maze.cols)], 0)
+            maze._set_tile(Position(3, 1), " ")
+            for index in range(maze.rows * maze.cols):
+                self.assertEqual(maze.neighbour_masks[index], maze._cell_mask(index))
+
+    def assert_valid_path(self, maze: Maze, path: List[Position] | None) -> None:
+        self.assertIsNotNone(path)
+        self.assertEqual(path[0], maze.start_position)
+        self.assertTrue(maze.is_exit(path[-1]))
+        for current, following in zip(path, path[1:]):
+            self.assertIn(following, maze.get_available_positions(current))
+
+    @staticmethod
+    def visited(maze: Maze) -> set[Position]:
+        return {Position(row, col) for row in range(maze.rows) for col in range(maze.cols) if maze.grid[row][col].visited}
+
+    @number("5.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_search_engines(self) -> None:
+        for engine in ("bfs", "dfs", "bidirectional", "astar", "jps"):
+            for compact in (False, True):
+                maze: Maze = self.load_without_hollows("task3/maze4.txt", compact)
+                path: List[Position] | None = maze.find_way_out(engine)
+                self.assert_valid_path(maze, path)
+                self.assertTrue(maze.grid[path[0].row][path[0].col].visited)
+                if engine != "dfs":
+                    self.assertEqual(len(path), 8, f"{engine} should find a shortest path")
+
+                for sealed_name in ("task3/visit_all.txt", "task3/no_valid_exit.txt"):
+                    sealed: Maze = self.load_without_hollows(sealed_name, compact)
+                    self.assertIsNone(sealed.find_way_out(engine))
+                    if engine != "jps":
+                        # With no way out exactly the cells reachable from the start are visited
+                        reference: Maze = self.load_without_hollows(sealed_name, compact)
+                        reference.find_way_out("bfs")
+                        self.assertEqual(self.visited(sealed), self.visited(reference), f"{engine} on {sealed_name}")
+        with self.assertRaises(ValueError):
+            maze.find_way_out("teleport")
+
+        # Every cell of the path is visited, including the forward half of a bidirectional path
+        # when the searches meet while the backward side is expanding.
+        walls: List[Position] = [Position(row, col) for row, col in ((4, 0), (3, 0), (5, 7), (7, 6), (0, 0), (5, 2), (6, 5),
+                                                                      (0, 4), (0, 2), (2, 7), (2, 1), (1, 7), (3, 7), (5, 5))]
+        for engine in ENGINES:
+            for compact in (False, True):
+                for maze in (self.load_without_hollows("task3/maze4.txt", compact),
+                             Maze(Position(3, 4), [Position(6, 1), Position(4, 3)], walls, [], 8, 8, compact)):
+                    path = maze.find_way_out(engine)
+                    self.assert_valid_path(maze, path)
+                    self.assertEqual([p for p in path if not maze.grid[p.row][p.col].visited], [], engine)
+
+    @number("5.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_exit_distance_field(self) -> None:
+        maze: Maze = self.load_without_hollows("task3/maze4.txt", compact=True)
+        for index in range(maze.rows * maze.cols):
+            if maze._is_wall(index):
+                self.assertEqual(maze.exit_distances[index], -1)
+                continue
+            start: Position = maze.position_at(index)
+            path: List[Position] | None = maze.find_way_out("distance_field", start)
+            expected: List[Position] | None = maze.find_way_out("bfs", start)
+            self.assertEqual(len(path), len(expected))
+            self.assertEqual(path[0], start)
+            self.assertTrue(maze.is_exit(path[-1]))
+
+        # Sealing off the exits must invalidate the field
+        maze.exit_distances
+        maze._set_tile(Position(2, 5), "#")
+        maze._set_tile(Position(2, 6), "#")
+        self.assertIsNone(maze.find_way_out("distance_field"))
+        self.assertEqual(maze.exit_distances[maze.start_position.pack(maze.cols)], -1)
+
+    @number("5.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_component_labels(self) -> None:
+        maze: Maze = self.load_without_hollows("task3/visit_all.txt")
+        maze.label_components()
+        self.assertFalse(maze.has_way_out(maze.start_position))
+        self.assertIsNone(maze.find_way_out(fill_visited=False))
+        self.assertFalse(any(cell.visited for row in maze.grid for cell in row))
+        self.assertIsNone(maze.find_way_out())
+        self.assertTrue(maze.grid[3][10].visited, "The search should still run when visited is needed")
+
+        maze = self.load_without_hollows("task3/maze4.txt")
+        maze.label_components()
+        self.assertTrue(maze.has_way_out(maze.start_position))
+        maze._set_tile(Position(2, 5), "#")
+        maze._set_tile(Position(2, 6), "#")
+        self.assertFalse(maze.has_way_out(maze.start_position), "Labels should be rebuilt after the maze changes")
+
+    @number("5.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_numpy_wavefront(self) -> None:
+        for compact in (False, True):
+            maze: Maze = self.load_without_hollows("task3/maze4.txt", compact)
+            reference: Maze = self.load_without_hollows("task3/maze4.txt", compact)
+            path: List[Position] | None = maze.find_way_out("numpy")
+            self.assert_valid_path(maze, path)
+            self.assertEqual(len(path), len(reference.find_way_out("bfs")))
+
+            sealed: Maze = self.load_without_hollows("task3/visit_all.txt", compact)
+            reference = self.load_without_hollows("task3/visit_all.txt", compact)
+            self.assertIsNone(sealed.find_way_out("numpy"))
+            reference.find_way_out("bfs")
+            for row, reference_row in zip(sealed.grid, reference.grid):
+                self.assertEqual([cell.visited for cell in row], [cell.visited for cell in reference_row])
+
+    @number("5.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_hierarchical_clusters(self) -> None:
+        maze: Maze = self.load_without_hollows("task3/maze4.txt", compact=True)
+        graph: ClusterGraph = maze.cluster_graph(cluster_size=3)
+        self.assert_valid_path(maze, maze.find_way_out("hierarchical"))
+        self.assertIs(maze.cluster_graph(cluster_size=3), graph, "The cluster graph should be cached")
+
+        # Close the row 2 corridor, only the clusters around the wall should change
+        untouched: dict = {cluster: edges for cluster, edges in graph.edges.items() if cluster not in (4, 1, 3, 5, 9)}
+        maze._set_tile(Position(2, 4), "#")
+        self.assertEqual({cluster: graph.edges[cluster] for cluster in untouched}, untouched)
+        rebuilt: ClusterGraph = ClusterGraph(maze, cluster_size=3)
+        self.assertEqual(graph.entrances, rebuilt.entrances)
+        self.assertEqual(graph.edges, rebuilt.edges)
+        path: List[Position] | None = maze.find_way_out("hierarchical")
+        self.assert_valid_path(maze, path)
+        self.assertNotIn(Position(2, 4), path)
+
+    @number("5.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_incremental_replanning(self) -> None:
+        for compact in (False, True):
+            maze: Maze = self.load_without_hollows("task3/maze4.txt", compact)
+            path: List[Position] | None = maze.replan()
+            self.assert_valid_path(maze, path)
+            self.assertEqual(len(path), 8)
+            for position in (maze.start_position, Position(1, 5), Position(0, 13)):
+                with self.assertRaises(ValueError):
+                    maze.set_wall(position)
+
+            # An edit away from the path must not cost a search from scratch
+            expanded: int = maze.incremental_planner().expanded
+            maze.set_wall(Position(1, 10))
+            self.assertEqual(maze.replan(), path)
+            self.assertLess(maze.incremental_planner().expanded - expanded, 3)
+
+            maze.set_wall(Position(2, 5))
+            maze.set_wall(Position(2, 6))
+            self.assertIsNone(maze.replan())
+            self.assertIsNone(maze.find_way_out("incremental"))
+            maze.clear_wall(Position(2, 6))
+            path = maze.find_way_out("incremental")
+            self.assert_valid_path(maze, path)
+            self.assertEqual(len(path) - 1, maze.exit_distances[maze.start_position.pack(maze.cols)])
+            self.assertEqual(maze.replan(Position(2, 7)), [Position(2, 7), Position(2, 6), Position(1, 6)])
+
+    @number("5.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_junction_graph(self) -> None:
+        maze: Maze = self.load_without_hollows("task3/maze4.txt", compact=True)
+        graph: JunctionGraph = maze.junction_graph
+        open_cells: int = sum(not maze._is_wall(index) for index in range(maze.rows * maze.cols))
+        self.assertLess(len(graph.nodes), open_cells)
+        self.assertIn(maze.start_position.pack(maze.cols), graph.nodes)
+        for node, edges in graph.edges.items():
+            for other, length, run in edges:
+                self.assertIn(other, graph.nodes)
+                self.assertEqual(length, len(run) + 1)
+                self.assertTrue(all(cell not in graph.nodes for cell in run))
+
+        path: List[Position] | None = maze.find_way_out("junction")
+        self.assert_valid_path(maze, path)
+        self.assertEqual(len(path), 8)
+        self.assertEqual(len(maze.find_way_out("junction", start=Position(4, 6))) - 1,
+                         maze.exit_distances[Position(4, 6).pack(maze.cols)])
+
+        # The graph is rebuilt after the maze changes
+        maze.set_wall(Position(2, 5))
+        maze.set_wall(Position(2, 6))
+        self.assertIsNot(maze.junction_graph, graph)
+        self.assertIsNone(maze.find_way_out("junction"))
+
+    @number("5.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_dead_end_filling(self) -> None:
+        layout: List[str] = ["#########",
+                             "#P.....E#",
+                             "#.###.###",
+                             "#.#...#.#",
+                             "#########"]
+        walls: List[Position] = [Position(row, col) for row, line in enumerate(layout)
+                                 for col, tile in enumerate(line) if tile == "#"]
+        for compact in (False, True):
+            maze: Maze = Maze(Position(1, 1), [Position(1, 7)], walls, [], 5, 9, compact)
+            sealed: set[Position] = {maze.position_at(index) for index in maze.dead_end_fill.sealed}
+            self.assertEqual(sealed, {Position(3, 1), Position(2, 1), Position(3, 3), Position(3, 4),
+                                      Position(3, 5), Position(2, 5), Position(3, 7)})
+            self.assertIs(maze.dead_end_fill, maze.dead_end_fill)
+
+            for engine in ("bfs", "astar", "jps"):
+                path: List[Position] | None = maze.clone().find_way_out(engine, fill_dead_ends=True, report_sealed=False)
+                self.assert_valid_path(maze, path)
+                self.assertEqual(len(path), 7)
+            maze.find_way_out(fill_dead_ends=True, report_sealed=False)
+            self.assertFalse(any(maze.grid[position.row][position.col].visited for position in sealed))
+            with self.assertRaises(ValueError):
+                maze.find_way_out("distance_field", fill_dead_ends=True)
+
+            # With no way out every reachable cell is still reported as visited
+            maze = maze.clone()
+            maze.set_wall(Position(1, 6))
+            unfilled: Maze = maze.clone()
+            self.assertIsNone(maze.find_way_out(fill_dead_ends=True))
+            self.assertIsNone(unfilled.find_way_out())
+            self.assertEqual([[cell.visited for cell in row] for row in maze.grid],
+                             [[cell.visited for cell in row] for row in unfilled.grid])
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from hollows import Hollow
+from maze import Maze, MazeCell, Position, TreasureRoute
+from treasure import Treasure
+
+
+class TestTreasureRoutes(TestCase):
+    def setUp(self) -> None:
+        self.maze: Maze = Maze.load_maze_from_file("task3/treasures/maze1.txt")
+        self.fill_hollows({Position(2, 1): [Treasure(43, 76), Treasure(20, 5)],
+                           Position(1, 6): [Treasure(45, 4)],
+                           Position(2, 7): [Treasure(73, 70), Treasure(9, 3)]})
+
+    def fill_hollows(self, treasures: dict[Position, List[Treasure]]) -> None:
+        for position, hollow_treasures in treasures.items():
+            hollow: Hollow = self.maze.grid[position.row][position.col].tile
+            hollow.treasures = list(hollow_treasures)
+            hollow.restructure_hollow()
+
+    def cells(self, path: List[Position]) -> List[MazeCell]:
+        return [self.maze.grid[position.row][position.col] for position in path]
+
+    def assert_route(self, route: TreasureRoute, backpack_capacity: int) -> None:
+        self.assertEqual(route.path[0], self.maze.start_position)
+        self.assertTrue(self.maze.is_exit(route.path[-1]))
+        for current, following in zip(route.path, route.path[1:]):
+            self.assertIn(following, self.maze.get_available_positions(current))
+        # Planning must not take anything, taking along the route must give what was planned
+        self.assertEqual(self.maze.take_treasures(self.cells(route.path), backpack_capacity) or [], route.treasures)
+
+    @number("6.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_plan_most_valuable_route(self) -> None:
+        route: TreasureRoute | None = self.maze.plan_treasure_route(150)
+        self.assertIsNotNone(route)
+        # One treasure per hollow, the one with the best ratio that fits
+        self.assertEqual(route.treasures, [Treasure(20, 5), Treasure(45, 4), Treasure(9, 3)])
+        self.assert_route(route, 150)
+
+        # Taking from the mystical hollow first would leave no room for anything else
+        self.fill_hollows({Position(2, 1): [Treasure(43, 76), Treasure(20, 5)],
+                           Position(1, 6): [Treasure(45, 4)],
+                           Position(2, 7): [Treasure(73, 70), Treasure(9, 3)]})
+        route = self.maze.plan_treasure_route(7)
+        self.assertEqual(route.treasures, [Treasure(45, 4), Treasure(9, 3)])
+        self.assertNotIn(Position(2, 1), route.path)
+        self.assert_route(route, 7)
+
+    @number("6.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_plan_within_step_budget(self) -> None:
+        shortest: int = len(self.maze.find_way_out()) - 1
+        self.assertIsNone(self.maze.plan_treasure_route(150, max_steps=shortest - 1))
+        route: TreasureRoute | None = self.maze.plan_treasure_route(150, max_steps=shortest)
+        self.assertEqual(len(route.path) - 1, shortest)
+        self.assertLess(route.value, 20 + 45 + 9)
+        self.assertIs(self.maze.route_distances, self.maze.route_distances)
+        self.assert_route(route, 150)
+
+    @number("6.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_iter_treasures_streams_path(self) -> None:
+        path: List[Position] = [Position(3, 1), Position(2, 1), Position(1, 1), Position(1, 2), Position(1, 3),
+                                Position(1, 4), Position(1, 5), Position(1, 6), Position(2, 6), Position(2, 7), Position(1, 7)]
+        read: List[Position] = []
+
+        def cells():
+            for position in path:
+                read.append(position)
+                yield position.pack(self.maze.cols)
+
+        clone: Maze = self.maze.clone()
+        expected: List[Treasure] | None = clone.take_treasures([clone.grid[p.row][p.col] for p in path], 12)
+        self.assertEqual(list(self.maze.iter_treasures(cells(), 12)), expected)
+        # The backpack is full after the last hollow so the exit is never read
+        self.assertEqual(read, path[:-1])
+
+        # With 20 + 45 taken the backpack can't fit the lightest treasure left (3kg), so the path isn't read further
+        self.fill_hollows({Position(2, 1): [Treasure(43, 76), Treasure(20, 5)],
+                           Position(1, 6): [Treasure(45, 4)],
+                           Position(2, 7): [Treasure(73, 70), Treasure(9, 3)]})
+        read.clear()
+        taken: List[Treasure] = list(self.maze.iter_treasures(cells(), 11))
+        self.assertEqual(taken, [Treasure(20, 5), Treasure(45, 4)])
+        self.assertEqual(read, path[:path.index(Position(1, 6)) + 1])
+        self.assertEqual(list(self.maze.iter_treasures(self.cells(path), 0)), [])
+
+        # A backpack that can't fit anything left in the maze doesn't read the path at all
+        for capacity in (0, 2):
+            read.clear()
+            self.assertEqual(list(self.maze.iter_treasures(cells(), capacity)), [])
+            self.assertEqual(read, [], f"capacity {capacity}")
+
+    @number("6.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_evaluate_many_capacities(self) -> None:
+        self.maze = Maze.load_maze_from_file("task3/treasures/maze2.txt")
+        mystic: List[Treasure] = [Treasure(90, 28), Treasure(32, 11), Treasure(94, 34), Treasure(11, 17), Treasure(96, 13),
+                                  Treasure(51, 6), Treasure(84, 14), Treasure(87, 23), Treasure(70, 19), Treasure(97, 30)]
+        self.fill_hollows({Position(1, 2): mystic})
+        path: List[MazeCell] = self.cells([Position(1, col) for col in range(1, 9)])
+        capacities: List[int] = [0, 5, 7, 31, 1008]
+
+        results: List[List[Treasure] | None] = self.maze.evaluate_take_treasures(path, capacities)
+        self.assertEqual(len(self.maze.grid[1][2].tile), len(mystic))
+        for capacity, result in zip(capacities, results):
+            self.fill_hollows({Position(1, 2): mystic})
+            self.assertEqual(result, self.maze.take_treasures(path, capacity))
+        self.assertEqual(results[:3], [None, None, [Treasure(51, 6)]])
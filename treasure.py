@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+from array import array
+from math import gcd
+
 from config import TreasureConfig
 from random_gen import RandomGen
-from typing import List
+from typing import Iterator, List, Tuple
+
+from data_structures.heap import MaxHeap
 
 
 class Treasure:
+    __slots__ = ("value", "weight")
+
     def __init__(self, value: int, weight: int) -> None:
         """
         Complexity:
@@ -29,10 +36,120 @@ class Treasure:
         return str(self)
 
 
+class TreasureView(Treasure):
+    """ A read only Treasure whose value and weight live in a TreasureBatch. """
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: TreasureBatch, index: int) -> None:
+        self._batch: TreasureBatch = batch
+        self._index: int = index
+
+    @property
+    def value(self) -> int:
+        return self._batch.values[self._index]
+
+    @property
+    def weight(self) -> int:
+        return self._batch.weights[self._index]
+
+
+class TreasureBatch:
+    """
+    Treasures stored as parallel columns of unsigned ints instead of one object each.
+
+    Indexing or iterating hands out TreasureViews, made on demand, which compare equal to the
+    Treasures with the same value and weight. The optional ranks column holds the position of
+    each treasure when they are ordered from the greatest value / weight ratio down, letting
+    hollows build from a batch without sorting it again.
+    """
+
+    def __init__(self, values: array, weights: array, ranks: array | None = None) -> None:
+        """
+        Args:
+            values(array): The value of each treasure, an array('I').
+            weights(array): The weight of each treasure, an array('I') as long as values.
+            ranks(array | None): The ratio rank of each treasure, see `rank_by_ratio`.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if len(values) != len(weights) or (ranks is not None and len(ranks) != len(values)):
+            raise ValueError("Every column of a batch must have one entry per treasure")
+        self.values: array = values
+        self.weights: array = weights
+        self.ranks: array | None = ranks
+
+    @classmethod
+    def from_treasures(cls, treasures: List[Treasure], rank: bool = False) -> TreasureBatch:
+        """
+        Args:
+            treasures(List[Treasure]): The treasures to store.
+            rank(bool): Whether to fill in the ranks column.
+
+        Complexity:
+            Best Case Complexity: O(n) where n is the number of treasures.
+            Worst Case Complexity: O(n log n) when ranking them.
+        """
+        batch: TreasureBatch = cls(array('I', [treasure.value for treasure in treasures]),
+                                   array('I', [treasure.weight for treasure in treasures]))
+        if rank:
+            batch.rank_by_ratio()
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> TreasureView:
+        if not 0 <= index < len(self.values):
+            raise IndexError(index)
+        return TreasureView(self, index)
+
+    def __iter__(self) -> Iterator[TreasureView]:
+        for index in range(len(self.values)):
+            yield TreasureView(self, index)
+
+    def ratio(self, index: int) -> float:
+        return self.values[index] / self.weights[index]
+
+    def rank_by_ratio(self) -> None:
+        """
+        Fills in the ranks column, 0 for the greatest ratio, ties going to the earlier treasure.
+
+        Complexity:
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+            n is the number of treasures in the batch, popping every treasure off a heap.
+        """
+        heap: MaxHeap[Tuple[float, int]] = MaxHeap.heapify([(self.ratio(index), -index) for index in range(len(self))])
+        ranks: array = array('I', [0]) * len(self)
+        for rank in range(len(self)):
+            ranks[-heap.get_max()[1]] = rank
+        self.ranks = ranks
+
+    def by_ratio(self) -> Iterator[int]:
+        """
+        Returns:
+            Iterator[int] - The indices of the treasures from the smallest ratio up, using the ranks column.
+
+        Complexity:
+            Best Case Complexity: O(n) where n is the number of treasures in the batch.
+            Worst Case Complexity: O(n) where n is the number of treasures in the batch.
+        """
+        if self.ranks is None:
+            raise ValueError("The batch hasn't been ranked, see rank_by_ratio")
+        order: array = array('I', self.ranks)
+        for index in range(len(self)):
+            order[len(self) - 1 - self.ranks[index]] = index
+        return iter(order)
+
+
 def generate_treasures() -> List[Treasure]:
     """
     This function will generate a random list of treasures with random values and weights.
     The weights, values and ratios of the treasures will be unique within the output list.
+    The treasures drawn for a seed never change, use `generate_unique_treasures` for larger
+    ranges or counts where redrawing clashing treasures gets slow.
 
     Returns:
         list(Treasure): A random list of treasures
@@ -65,3 +182,127 @@ def generate_treasures() -> List[Treasure]:
             treasure_count += 1
 
     return hollow_treasures
+
+
+class _PartialShuffle:
+    """
+    Draws the integers lo to hi without replacement, one Fisher-Yates step per draw.
+    Only the positions the shuffle has moved are stored, so the range can be far larger than the number of draws.
+    """
+
+    def __init__(self, lo: int, hi: int) -> None:
+        self.lo: int = lo
+        self.remaining: int = hi - lo + 1
+        self.moved: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def draw(self) -> int:
+        """ O(1) expected, assuming dictionary operations are O(1). """
+        pick: int = RandomGen.randint(0, self.remaining - 1)
+        last: int = self.remaining - 1
+        drawn: int = self.moved.get(pick, pick)
+        self.moved[pick] = self.moved.get(last, last)
+        self.moved.pop(last, None)
+        self.remaining -= 1
+        return self.lo + drawn
+
+
+def _ratio(value: int, weight: int) -> Tuple[int, int]:
+    """ The value / weight ratio as an exact reduced fraction, equal ratios always give equal pairs. """
+    divisor: int = gcd(value, weight)
+    return value // divisor, weight // divisor
+
+
+def generate_unique_treasures(number_of_treasures: int, max_value: int, max_weight: int,
+                              min_value: int = 1, min_weight: int = 1) -> List[Treasure]:
+    """
+    Generates treasures whose weights, values and value / weight ratios are all unique, drawing
+    every random number from RandomGen so the output only depends on its seed.
+
+    Weights and values are drawn without replacement by partial shuffles of their ranges, so no draw
+    is ever thrown away for being used already. Ratios are compared as exact fractions. A value whose
+    ratio clashes with the weight it was drawn for is kept aside and offered to the next weights first;
+    if no value is left for the last weights, values are swapped with earlier treasures.
+
+    Args:
+        number_of_treasures(int): The number of treasures to generate.
+        max_value(int): The greatest value a treasure can have.
+        max_weight(int): The greatest weight a treasure can have.
+        min_value(int): The smallest value a treasure can have.
+        min_weight(int): The smallest weight a treasure can have, must be at least 1.
+
+    Returns:
+        List[Treasure]: The treasures, in the order they were generated.
+
+    Raises:
+        ValueError: If the ranges hold fewer than number_of_treasures values or weights,
+        or the treasures can't be given unique ratios.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is number_of_treasures, when no ratios clash.
+        Worst Case Complexity: O(N^2) when most values clash, expected O(N) as long as the value
+        range isn't much smaller than the product of N and the number of values sharing a ratio.
+    """
+    if min_weight < 1:
+        raise ValueError("Treasures must weigh at least 1kg")
+    if number_of_treasures > min(max_value - min_value + 1, max_weight - min_weight + 1):
+        raise ValueError(f"Can't draw {number_of_treasures} unique values and weights from the ranges given")
+
+    weights: _PartialShuffle = _PartialShuffle(min_weight, max_weight)
+    values: _PartialShuffle = _PartialShuffle(min_value, max_value)
+    treasures: List[Treasure] = []
+    ratios: set[Tuple[int, int]] = set()
+    # Values drawn that clashed with the weight they were drawn for.
+    spare: List[int] = []
+    for _ in range(number_of_treasures):
+        weight: int = weights.draw()
+        value: int | None = None
+        for k in range(len(spare)):
+            if _ratio(spare[k], weight) not in ratios:
+                value = spare[k]
+                spare[k] = spare[-1]
+                spare.pop()
+                break
+        while value is None and len(values) > 0:
+            drawn: int = values.draw()
+            if _ratio(drawn, weight) in ratios:
+                spare.append(drawn)
+            else:
+                value = drawn
+        if value is None:
+            value = _swap_spare_value(treasures, ratios, spare, weight)
+        ratios.add(_ratio(value, weight))
+        treasures.append(Treasure(value, weight))
+    return treasures
+
+
+def _swap_spare_value(treasures: List[Treasure], ratios: set[Tuple[int, int]], spare: List[int], weight: int) -> int:
+    """
+    Finds an earlier treasure whose value can go with weight while it takes a spare value instead.
+
+    Returns:
+        int - The value for weight, removed from the earlier treasure.
+
+    Raises:
+        ValueError: If no earlier treasure and spare value fit together.
+
+    Complexity:
+        Best Case Complexity: O(1) when the first treasure and spare value fit.
+        Worst Case Complexity: O(N * S) where N is the number of treasures and S the number of spare values.
+    """
+    for treasure in treasures:
+        ratios.discard(_ratio(treasure.value, treasure.weight))
+        for k in range(len(spare)):
+            moved: Tuple[int, int] = _ratio(treasure.value, weight)
+            replaced: Tuple[int, int] = _ratio(spare[k], treasure.weight)
+            if moved not in ratios and replaced not in ratios and moved != replaced:
+                value: int = treasure.value
+                treasure.value = spare[k]
+                spare[k] = spare[-1]
+                spare.pop()
+                ratios.add(replaced)
+                return value
+        ratios.add(_ratio(treasure.value, treasure.weight))
+    raise ValueError("Can't give every treasure a unique ratio with the ranges given")